@@ -6,6 +6,9 @@ function toggleNav(){
 document.addEventListener('DOMContentLoaded', loadPartials);
 
 async function loadPartials(){
+  // Pages built by tools/assemble_site.py already contain the partials
+  // (and the active nav link), so there is nothing to fetch.
+  if (document.documentElement.dataset.partials === 'inline') return;
   try {
     // 1) HEAD PARTIAL — insert directly into <head> (no placeholder needed)
     //    Keep your per-page <title> in the HTML file itself.
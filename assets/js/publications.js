@@ -7,6 +7,7 @@
   const clearBtn = $('#clear'), loadMoreBtn = $('#load-more'), loadMoreWrap = $('#load-more-wrap');
 
   let allPubs = [], filtered = []; let page = 0;
+  let related = {}, byKey = new Map();
   const norm = t => (t || '').toLowerCase().replace(/\s+/g, ' ').trim();
   const bust = () => `?_=${Date.now()}`;
 
@@ -66,6 +67,48 @@
     return (a+b).toUpperCase();
   }
 
+  // data/publications.index.json (tools/pipeline.py) has every paper merged
+  // across members with group authors already resolved to member ids.
+  async function loadIndex() {
+    try {
+      const j = await fetchJSON('data/publications.index.json', 'publications.index.json');
+      return j && Array.isArray(j.publications) ? j.publications : null;
+    } catch (e) {
+      console.warn('[pubs] no prebuilt index, merging in the browser -', e.message);
+      return null;
+    }
+  }
+
+  // data/publications.related.json (tools/related.py): paper key -> [[key, score], ...]
+  async function loadRelated() {
+    try {
+      const j = await fetchJSON('data/publications.related.json', 'publications.related.json');
+      return j && j.related ? j.related : {};
+    } catch (e) {
+      console.warn('[pubs] no related map -', e.message);
+      return {};
+    }
+  }
+
+  function fromIndex(index, profiles) {
+    const byId = new Map(profiles.map(p => [p.id, p]));
+    return index.map(pub => {
+      const matches = (pub.members || []).map(id => byId.get(id)).filter(Boolean);
+      const cats = new Set(); matches.forEach(m => (m.categories||[]).forEach(c => cats.add(c)));
+      return {
+        key: pub.key,
+        title: pub.title || '',
+        year: pub.year ?? null,
+        venue: pub.venue || '',
+        doi: pub.doi || null,
+        url: pub.url || '',
+        authors: pub.authors || [],
+        groupAuthors: matches.map(m => ({ id:m.id, name:m.name, photo:m.photo || null })),
+        categories: [...cats]
+      };
+    });
+  }
+
   async function loadAll() {
     // Manifest + profiles
     const ids = await loadManifest();
@@ -75,6 +118,15 @@
     // author filter options
     authorEl.innerHTML = `<option value="">All authors (group)</option>` + profiles.map(p=>`<option value="${p.id}">${p.name}</option>`).join('');
 
+    const [index, rel] = await Promise.all([loadIndex(), loadRelated()]);
+    if (index) {
+      allPubs = fromIndex(index, profiles)
+        .sort((a,b)=>(b.year||0)-(a.year||0) || (a.title||'').localeCompare(b.title||''));
+      related = rel;
+      byKey = new Map(allPubs.map(p => [p.key, p]));
+      return finishLoad();
+    }
+
     // Load local pubs for each member
     const perMember = await Promise.all(profiles.map(async p => ({ profile: p, pubs: await loadMemberPubs(p.id) })));
 
@@ -121,7 +173,10 @@
 
     allPubs = Array.from(merged.values())
       .sort((a,b)=>(b.year||0)-(a.year||0) || (a.title||'').localeCompare(b.title||''));
+    finishLoad();
+  }
 
+  function finishLoad() {
     const years = [...new Set(allPubs.map(p=>p.year).filter(Boolean))].sort((a,b)=>b-a);
     yearEl.innerHTML = `<option value="">All years</option>` + years.map(y=>`<option value="${y}">${y}</option>`).join('');
     const allCats = [...new Set(allPubs.flatMap(p=>p.categories||[]))].sort((a,b)=>a.localeCompare(b));
@@ -148,11 +203,17 @@
         const names = (p.authors||[]).slice(0,3).join(', ');
         authorsHtml = names ? `<div class="authors"><span class="author-names">${names}${(p.authors||[]).length>3?' <span class="sep">…</span>':''}</span></div>` : '';
       }
+      const rel = (related[p.key] || []).map(([k]) => byKey.get(k)).filter(Boolean);
+      const relatedHtml = rel.length ? `
+          <details class="pub-related">
+            <summary>Related (${rel.length})</summary>
+            <ul>${rel.map(r => `<li><a href="${r.url||'#'}" target="_blank" rel="noopener">${r.title}</a>${r.year?` <span class="sep">${r.year}</span>`:''}</li>`).join('')}</ul>
+          </details>` : '';
       return `
         <article class="pub-card">
           <h3 class="pub-title"><a href="${p.url||'#'}" target="_blank" rel="noopener">${p.title}</a></h3>
           <div class="pub-meta">${p.venue ? `<em>${p.venue}</em>` : ''}${p.venue&&p.year?' • ':''}${p.year||''}</div>
-          ${authorsHtml}
+          ${authorsHtml}${relatedHtml}
         </article>`;
     }).join('');
     resultsEl.insertAdjacentHTML('beforeend', html);
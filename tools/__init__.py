@@ -0,0 +1,7 @@
+"""
+Site data tools (publication sync, categorization, highlights).
+
+Each module also runs as a plain script (``python tools/<name>.py``); the
+modules import each other by bare name, so ``python -m tools`` puts this
+directory on sys.path before dispatching. See tools/cli.py.
+"""
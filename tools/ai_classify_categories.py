@@ -3,6 +3,9 @@ import json, glob, re
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Tuple
 
+import runlog
+from publication import Publication
+
 ROOT = Path(__file__).resolve().parents[1]
 MEMBERS_DIR = ROOT / "members"
 DATA_DIR = ROOT / "data"
@@ -120,14 +123,30 @@ def map_topics_to_categories(topics: List[str]) -> List[str]:
     return out
 
 # --------- Zero-shot model ----------
+BATCH_SIZE = 8
+HYPOTHESIS = "This paper is about {}."
+
+@runlog.span("model.load")
 def build_classifier():
     from transformers import pipeline
     return pipeline("zero-shot-classification", model=MODEL_NAME, device=-1, truncation=True)
 
-def zs(texts: List[str], labels: List[str]):
-    from transformers import pipeline
-    zsc = build_classifier()
-    return zsc(texts, labels, multi_label=True, hypothesis_template="This paper is about {}.")
+def zs(texts: List[str], labels: List[str], zsc=None) -> List[Dict[str, Any]]:
+    zsc = zsc or build_classifier()
+    with runlog.span("model.infer"):
+        results = zsc(texts, labels, multi_label=True, hypothesis_template=HYPOTHESIS)
+    if isinstance(results, dict): results = [results]
+    return results
+
+def ai_text(p: Dict[str, Any]) -> str:
+    # Build text for AI: prefer abstract when present
+    t = norm(p.get("title"))
+    v = norm(p.get("venue"))
+    a = norm(p.get("abstract"))  # present only if topics were missing
+    text = t
+    if v: text += f". Venue: {v}."
+    if a: text += f" Abstract: {a[:600]}"
+    return text
 
 def pick_labels(res: Dict[str, Any], threshold=0.5, top_k=2) -> Tuple[List[str], Dict[str, float]]:
     labels = res["labels"]; scores = res["scores"]
@@ -142,98 +161,92 @@ def pick_labels(res: Dict[str, Any], threshold=0.5, top_k=2) -> Tuple[List[str],
     return [l for l,_ in kept], {l: float(s) for l, s in adjusted}
 
 # --------- Main ----------
-def main():
-    labels = load_labels()
-    overrides = load_overrides()
-
-    simple, verbose = {}, {}
+def iter_corpus() -> Iterable[Dict[str, Any]]:
     files = glob.glob(str(MEMBERS_DIR / "*" / "publications.json"))
     files.sort()
-
-    need_ai_payloads = []  # (key, pub, text)
-
-    # First pass: map topics; collect AI fallbacks
     for path in files:
         try:
             obj = json.loads(Path(path).read_text(encoding="utf-8"))
         except Exception as e:
             print(f"[warn] skipped {path}: {e}"); continue
+        yield from iter_publications(obj)
+
+def verbose_entry(p, cats: List[str], source: str, scores: Dict[str, float]) -> Dict[str, Any]:
+    return {
+        "title": p.get("title") or "(untitled)",
+        "categories": cats,
+        "doi": norm_doi(p.get("doi","")) or None,
+        "url": p.get("url") or None,
+        "venue": p.get("venue") or None,
+        "year": p.get("year") or None,
+        "source": source,
+        "scores": scores
+    }
+
+def classify(pubs: Iterable[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Classify `pubs` (default: every members/*/publications.json) and write both maps."""
+    labels = load_labels()
+    overrides = load_overrides()
 
-        for p in iter_publications(obj):
-            if not isinstance(p, dict): continue
+    # key -> (Publication, categories, source, scores); both output maps are
+    # rendered from this once, at the end
+    resolved = {}
+    need_ai = []           # (key, Publication); model text is built per batch
+    pdf_text = None        # oa_pdf url -> abstract, loaded on first need
+
+    # First pass: map topics; collect AI fallbacks
+    with runlog.span("topics"):
+        for p in (iter_corpus() if pubs is None else pubs):
+            if not isinstance(p, (dict, Publication)): continue
+            p = Publication.from_dict(p)
             key = paper_key(p)
             if not key: continue
 
             # Manual override beats everything
             if key in overrides:
-                cats = sorted(set(overrides[key]))
-                simple[key] = cats
-                verbose[key] = {
-                    "title": p.get("title") or "(untitled)",
-                    "categories": cats,
-                    "doi": norm_doi(p.get("doi","")) or None,
-                    "url": p.get("url") or None,
-                    "venue": p.get("venue") or None,
-                    "year": p.get("year") or None,
-                    "source": "override",
-                    "scores": {}
-                }
+                resolved[key] = (p, sorted(set(overrides[key])), "override", {})
                 continue
 
-            topics = p.get("topics") or []
-            mapped = map_topics_to_categories(topics)
-
+            mapped = map_topics_to_categories(p.topics or [])
             if mapped:
-                simple[key] = mapped
-                verbose[key] = {
-                    "title": p.get("title") or "(untitled)",
-                    "categories": mapped,
-                    "doi": norm_doi(p.get("doi","")) or None,
-                    "url": p.get("url") or None,
-                    "venue": p.get("venue") or None,
-                    "year": p.get("year") or None,
-                    "source": "topics",
-                    "scores": {}
-                }
+                resolved[key] = (p, mapped, "topics", {})
             else:
-                # Build text for AI: prefer abstract when present
-                t = norm(p.get("title"))
-                v = norm(p.get("venue"))
-                a = norm(p.get("abstract"))  # present only if topics were missing
-                text = t
-                if v: text += f". Venue: {v}."
-                if a: text += f" Abstract: {a[:600]}"
-                need_ai_payloads.append((key, p, text))
+                # No topics: use the first-page abstract pdf_abstracts.py found, if any
+                if pdf_text is None:
+                    from pdf_abstracts import load_abstracts, wants_abstract
+                    pdf_text = load_abstracts()
+                if wants_abstract(p) and pdf_text.get(p.oa_pdf):
+                    p = p.replace(abstract=pdf_text[p.oa_pdf])
+                    runlog.count("source.pdf_abstract")
+                need_ai.append((key, p))
+    runlog.count("source.ai", len(need_ai))
+    runlog.count("source.resolved", len(resolved))
 
     # Second pass: run AI only for those without topics/overrides
-    if need_ai_payloads:
-        B = 8
-        from transformers import pipeline
-        zsc = pipeline("zero-shot-classification", model=MODEL_NAME, device=-1, truncation=True)
-        for i in range(0, len(need_ai_payloads), B):
-            batch = need_ai_payloads[i:i+B]
-            texts = [x[2] for x in batch]
-            results = zsc(texts, labels, multi_label=True, hypothesis_template="This paper is about {}.")
-            if isinstance(results, dict): results = [results]
-            for (key, p, _), res in zip(batch, results):
+    if need_ai:
+        B = BATCH_SIZE
+        zsc = build_classifier()
+        for i in range(0, len(need_ai), B):
+            batch = need_ai[i:i+B]
+            results = zs([ai_text(p) for _, p in batch], labels, zsc)
+            for (key, p), res in zip(batch, results):
                 cats, scores_map = pick_labels(res, threshold=0.5, top_k=2)
-                simple[key] = cats
-                verbose[key] = {
-                    "title": p.get("title") or "(untitled)",
-                    "categories": cats,
-                    "doi": norm_doi(p.get("doi","")) or None,
-                    "url": p.get("url") or None,
-                    "venue": p.get("venue") or None,
-                    "year": p.get("year") or None,
-                    "source": "ai",
-                    "scores": scores_map
-                }
+                resolved[key] = (p, cats, "ai", scores_map)
 
     # Write outputs
+    simple = {key: cats for key, (_, cats, _, _) in resolved.items()}
+    verbose = {key: verbose_entry(*entry) for key, entry in resolved.items()}
     OUT_SIMPLE.write_text(json.dumps(simple, ensure_ascii=False, indent=2), encoding="utf-8")
     OUT_VERBOSE.write_text(json.dumps(verbose, ensure_ascii=False, indent=2), encoding="utf-8")
     print(f"[ok] wrote {OUT_SIMPLE} ({len(simple)} entries)")
     print(f"[ok] wrote {OUT_VERBOSE} ({len(verbose)} entries)")
+    return simple, verbose
+
+def main():
+    classify()
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        runlog.write_report("ai_classify_categories")
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Inline the head/header/footer partials into the site's pages at build time.
+
+assets/js/main.js used to fetch partials/head.html, header.html and
+footer.html after DOMContentLoaded on every page view. This tool writes
+them into each page instead:
+
+  - partials/head.html goes at the end of <head> (where main.js put it),
+    with the CRITICAL_CSS stylesheets inlined as <style> and every other
+    local stylesheet/script URL given a content hash (?v=<sha8>) so it
+    can be cached long-term;
+  - partials/header.html / footer.html go inside #site-header /
+    #site-footer, with the page's nav link already marked active;
+  - <html> gets data-partials="inline" so main.js skips its fetches.
+
+Pages are edited in place and stay hand-editable: inlined blocks sit
+between <!-- partial:NAME --> markers and are stripped before every
+rebuild. A digest of a page's inputs (its own source, the partials and
+the assets it references) is stored in the page; unchanged pages are not
+rewritten.
+
+Usage:
+  python tools/assemble_site.py            # top-level pages + members/*/index.html
+  python tools/assemble_site.py --force
+  python tools/assemble_site.py --strip    # undo: back to runtime partials
+"""
+
+import argparse, hashlib, os, re
+from glob import glob
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+PARTIALS_DIR = os.path.join(ROOT, "partials")
+
+# Small stylesheets every page needs for the first paint (base + header).
+CRITICAL_CSS = ("assets/css/styles.css", "assets/css/header.css")
+HASHED_EXT = (".css", ".js")
+# Pages without a nav entry of their own highlight this one instead.
+ACTIVE_NAV_FALLBACK = {"member.html": "people.html", "member_old.html": "people.html"}
+
+BLOCK_RE = re.compile(r"<!-- partial:(\w+) -->.*?<!-- /partial:\1 -->\n?", re.S)
+SLOT_RE = {
+    "header": re.compile(r'(<div id="site-header"[^>]*>)\s*(</div>)'),
+    "footer": re.compile(r'(<div id="site-footer"[^>]*>)\s*(</div>)'),
+}
+VERSION_RE = re.compile(r'(\b(?:href|src)="assets/[^"?#]+)\?v=[0-9a-f]{8}"')
+LOCAL_ASSET_RE = re.compile(r'(\b(?:href|src)=")(assets/[^"?#]+)(")')
+LINK_RE = re.compile(r'<link rel="stylesheet" href="(assets/[^"?#]+)"\s*/?>')
+DIGEST_RE = re.compile(r'<meta name="assembled-inputs" content="([0-9a-f]+)" />')
+HTML_TAG_RE = re.compile(r"<html\b([^>]*)>")
+
+def read_text(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return ""
+
+def write_text(path, text):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+# ---------- Assets ----------
+_asset_hashes = {}
+
+def asset_hash(rel):
+    if rel not in _asset_hashes:
+        try:
+            with open(os.path.join(ROOT, rel), "rb") as f:
+                _asset_hashes[rel] = hashlib.sha256(f.read()).hexdigest()[:8]
+        except OSError:
+            _asset_hashes[rel] = None
+    return _asset_hashes[rel]
+
+def version_urls(html):
+    def sub(m):
+        rel = m.group(2)
+        h = asset_hash(rel) if rel.endswith(HASHED_EXT) else None
+        return f"{m.group(1)}{rel}?v={h}{m.group(3)}" if h else m.group(0)
+    return LOCAL_ASSET_RE.sub(sub, html)
+
+def inline_critical(html):
+    def sub(m):
+        rel = m.group(1)
+        if rel not in CRITICAL_CSS: return m.group(0)
+        css = read_text(os.path.join(ROOT, rel)).strip()
+        return f"<style>/* {rel} */\n{css}\n</style>" if css else m.group(0)
+    return LINK_RE.sub(sub, html)
+
+# ---------- Pages ----------
+def strip(html):
+    """Back to the hand-edited source: no inlined blocks, no ?v= hashes."""
+    html = BLOCK_RE.sub("", html)
+    html = VERSION_RE.sub(r'\1"', html)
+    return html.replace(' data-partials="inline"', "")
+
+def mark_active(header, page):
+    target = ACTIVE_NAV_FALLBACK.get(page, page)
+    return re.sub(r'<a href="%s">' % re.escape(target), f'<a href="{target}" class="active">', header, count=1)
+
+def page_name(path):
+    rel = os.path.relpath(path, ROOT)
+    # Prerendered member pages (members/<id>/index.html) belong under People.
+    return "member.html" if rel.startswith("members" + os.sep) else os.path.basename(rel)
+
+def inputs_digest(src):
+    h = hashlib.sha256()
+    for p in [__file__] + [os.path.join(PARTIALS_DIR, f"{n}.html") for n in ("head", "header", "footer")]:
+        h.update(read_text(p).encode("utf-8"))
+    for rel in CRITICAL_CSS:
+        h.update(read_text(os.path.join(ROOT, rel)).encode("utf-8"))
+    h.update(src.encode("utf-8"))
+    for rel in sorted(set(m.group(2) for m in LOCAL_ASSET_RE.finditer(src + read_text(os.path.join(PARTIALS_DIR, "head.html"))))):
+        h.update(f"{rel}={asset_hash(rel)}".encode("utf-8"))
+    return h.hexdigest()
+
+def assemble(src, page, digest):
+    head = inline_critical(read_text(os.path.join(PARTIALS_DIR, "head.html")).strip())
+    header = mark_active(read_text(os.path.join(PARTIALS_DIR, "header.html")).strip(), page)
+    footer = read_text(os.path.join(PARTIALS_DIR, "footer.html")).strip()
+
+    html = src.replace("</head>",
+                       f'<!-- partial:head -->\n<meta name="assembled-inputs" content="{digest}" />\n'
+                       f"{head}\n<!-- /partial:head -->\n</head>", 1)
+    for name, body in (("header", header), ("footer", footer)):
+        html = SLOT_RE[name].sub(lambda m: f"{m.group(1)}<!-- partial:{name} -->\n{body}\n<!-- /partial:{name} -->{m.group(2)}", html, count=1)
+    html = HTML_TAG_RE.sub(lambda m: f'<html{m.group(1)} data-partials="inline">', html, count=1)
+    return version_urls(html)
+
+def process(path, force=False, undo=False):
+    """Assemble (or strip) one page; returns True if it was rewritten."""
+    current = read_text(path)
+    if 'id="site-header"' not in current and "partials/head.html" not in current:
+        return False
+    src = strip(current)
+    if undo:
+        if src == current: return False
+        write_text(path, src)
+        return True
+    digest = inputs_digest(src)
+    m = DIGEST_RE.search(current)
+    if m and m.group(1) == digest and not force:
+        return False
+    write_text(path, assemble(src, page_name(path), digest))
+    return True
+
+def pages():
+    top = sorted(glob(os.path.join(ROOT, "*.html")))
+    members = sorted(glob(os.path.join(ROOT, "members", "*", "index.html")))
+    return [p for p in top + members if 'id="site-header"' in read_text(p)]
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Inline partials and critical CSS into the site's pages.")
+    ap.add_argument("paths", nargs="*", help="pages to process (default: all pages with #site-header)")
+    ap.add_argument("--force", action="store_true", help="rewrite even if inputs are unchanged")
+    ap.add_argument("--strip", action="store_true", help="remove inlined partials instead")
+    args = ap.parse_args(argv)
+
+    targets = [os.path.abspath(p) for p in args.paths] or pages()
+    wrote = 0
+    for path in targets:
+        if process(path, force=args.force, undo=args.strip):
+            wrote += 1
+            print(f"- {'stripped' if args.strip else 'assembled'} {os.path.relpath(path, ROOT)}")
+    print(f"[ok] {wrote} of {len(targets)} pages rewritten")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Resolve publication author strings to group member ids.
+
+Each member's profile.json `name` (string or list) and `aliases` are
+normalized into hash keys once; an author string is then resolved with a
+few dict lookups instead of scanning every member's aliases.
+
+Normalization folds case and diacritics (Anaëlle -> anaelle). The last
+whitespace-separated token is the surname and keeps its hyphens
+(Dubois-Martin); in the given names hyphens and dots are separators
+(Jean-Pierre / J.-P.). Each name produces three keys:
+
+  full      "khabat heshami"
+  initials  "k heshami"      (every given name reduced to its initial)
+  first     "k heshami"      (first initial only: "j p smith" -> "j smith")
+
+Full keys always match. Initial keys are only tried for abbreviated author
+strings ("K. Heshami", not "Kamal Heshami") and only match when a single
+member owns them, so a shared surname and initial is not misattributed.
+
+  idx = AuthorIndex.from_profiles(profiles)
+  idx.resolve(["K. Heshami", "Someone Else"])  ->  ["khabat"]
+"""
+
+import re, unicodedata
+
+SEP_RE = re.compile(r"[\s\-‐-―.,]+")
+WORD_SEP_RE = re.compile(r"[\s,]+")
+HYPHEN_RE = re.compile(r"[‐-―]")
+ACCENT_RE = re.compile(r"['`´](?=[a-z])")   # BibTeX accent residue: S'anchez
+
+def _ascii_lower(name):
+    s = unicodedata.normalize("NFKD", str(name or ""))
+    return "".join(c for c in s if not unicodedata.combining(c)).lower()
+
+def fold(name):
+    """lowercase, strip diacritics, split on whitespace/hyphens/dots."""
+    return [t for t in SEP_RE.split(_ascii_lower(name)) if t]
+
+def name_parts(name):
+    """
+    (given names, surname), folded. The surname is the last word with its
+    hyphens ("dubois-martin"); given names are split on hyphens and dots.
+    """
+    s = ACCENT_RE.sub("", HYPHEN_RE.sub("-", _ascii_lower(name)))
+    words = [w for w in WORD_SEP_RE.split(s) if w.strip(".-")]
+    if not words:
+        return [], None
+    last = "-".join(t for t in re.split(r"[.\-]+", words[-1]) if t)
+    return fold(" ".join(words[:-1])), last
+
+def name_keys(name):
+    """(full_key, weak_keys) for one name string."""
+    given, last = name_parts(name)
+    if not last:
+        return None, ()
+    full = " ".join(given + [last])
+    if not given:
+        return full, ()
+    initials = " ".join([g[0] for g in given] + [last])
+    first = f"{given[0][0]} {last}"
+    return full, tuple(dict.fromkeys((initials, first)))
+
+def profile_names(profile):
+    name = profile.get("name")
+    names = [str(n) for n in name] if isinstance(name, list) else [str(name or "")]
+    names += [str(a) for a in (profile.get("aliases") or [])]
+    return [n for n in names if n.strip()]
+
+class AuthorIndex:
+    def __init__(self):
+        self.strong = {}   # full key -> member id
+        self.weak = {}     # initials key -> set(member ids)
+
+    @classmethod
+    def from_profiles(cls, profiles):
+        """profiles: iterable of (member_id, profile dict)."""
+        idx = cls()
+        for mid, prof in profiles:
+            for n in profile_names(prof):
+                full, weak = name_keys(n)
+                if not full: continue
+                idx.strong.setdefault(full, mid)
+                for k in weak:
+                    idx.weak.setdefault(k, set()).add(mid)
+        return idx
+
+    def lookup(self, author):
+        full, weak = name_keys(author)
+        if not full:
+            return None
+        mid = self.strong.get(full)
+        if mid:
+            return mid
+        given = full.split(" ")[:-1]
+        if not given or any(len(g) > 1 for g in given):
+            return None
+        for k in (full,) + weak:
+            owners = self.weak.get(k)
+            if owners and len(owners) == 1:
+                return next(iter(owners))
+        return None
+
+    def resolve(self, authors):
+        """Member ids for an author list, in author order, without duplicates."""
+        out = []
+        for a in authors or []:
+            mid = self.lookup(a)
+            if mid and mid not in out:
+                out.append(mid)
+        return out
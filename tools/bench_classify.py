@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Throughput / accuracy benchmark for the publication categorizers.
+
+Backends:
+  - topics    overrides + map_topics_to_categories() from ai_classify_categories.py
+              (papers it cannot resolve count as uncovered)
+  - rules     pick_categories() regex/fieldsOfStudy rules from classify_categories_old.py
+  - zeroshot  the transformers zero-shot pipeline from ai_classify_categories.py,
+              once per --batch-sizes entry (skipped if transformers is missing)
+
+The corpus is every publication in members/*/publications.json, cycled up to
+--size papers. Copies keep the reference key of the paper they were made
+from, so agreement is always measured against
+data/publication_categories_verbose.json.
+
+Every backend runs in its own process so model load time and peak RSS are
+not shared between runs.
+
+Usage:
+  python tools/bench_classify.py
+  python tools/bench_classify.py --size 5000 --backends topics rules
+  python tools/bench_classify.py --backends zeroshot --batch-sizes 1 8 32 --max-ai 128
+"""
+
+import argparse, glob, json, multiprocessing as mp, queue, resource, sys, time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+
+import ai_classify_categories as ai
+import classify_categories_old as old
+
+REFERENCE_PATH = ai.OUT_VERBOSE
+
+# ---------- Corpus ----------
+def load_corpus(size=None):
+    """[(reference_key, pub)], cycled up to `size` entries."""
+    base = []
+    for path in sorted(glob.glob(str(ai.MEMBERS_DIR / "*" / "publications.json"))):
+        try:
+            obj = json.loads(Path(path).read_text(encoding="utf-8"))
+        except Exception as e:
+            print(f"[warn] skipped {path}: {e}"); continue
+        for p in ai.iter_publications(obj):
+            if isinstance(p, dict):
+                base.append((ai.paper_key(p), p))
+    if not base or not size:
+        return base
+    out = []
+    for i in range(size):
+        key, p = base[i % len(base)]
+        if i >= len(base):
+            p = dict(p, title=f"{p.get('title') or ''} ({i // len(base)})")
+        out.append((key, p))
+    return out
+
+def load_reference():
+    try:
+        ref = json.loads(REFERENCE_PATH.read_text(encoding="utf-8"))
+    except Exception as e:
+        print(f"[warn] no reference labeling ({e}); agreement will be empty")
+        return {}
+    return {k: set(v.get("categories") or []) for k, v in ref.items() if isinstance(v, dict)}
+
+# ---------- Backends ----------
+def run_topics(corpus, _batch):
+    overrides = ai.load_overrides()
+    out = []
+    for key, p in corpus:
+        if key in overrides:
+            out.append(sorted(set(overrides[key])))
+        else:
+            out.append(ai.map_topics_to_categories(p.get("topics") or []) or None)
+    return out, 0.0
+
+def run_rules(corpus, _batch):
+    return [old.pick_categories(p) for _, p in corpus], 0.0
+
+def run_zeroshot(corpus, batch):
+    labels = ai.load_labels()
+    t0 = time.perf_counter()
+    zsc = ai.build_classifier()
+    load_s = time.perf_counter() - t0
+    texts = [ai.ai_text(p) for _, p in corpus]
+    out = []
+    for i in range(0, len(texts), batch):
+        for res in ai.zs(texts[i:i+batch], labels, zsc):
+            out.append(ai.pick_labels(res, threshold=0.5, top_k=2)[0])
+    return out, load_s
+
+BACKENDS = {"topics": run_topics, "rules": run_rules, "zeroshot": run_zeroshot}
+
+def zeroshot_available():
+    try:
+        import importlib.util
+        return importlib.util.find_spec("transformers") is not None
+    except Exception:
+        return False
+
+# ---------- Scoring ----------
+def agreement(corpus, predicted, reference):
+    exact = jacc = scored = covered = 0
+    for (key, _), pred in zip(corpus, predicted):
+        if pred is not None: covered += 1
+        ref = reference.get(key)
+        if ref is None: continue
+        scored += 1
+        got = set(pred or [])
+        if got == ref: exact += 1
+        union = got | ref
+        jacc += (len(got & ref) / len(union)) if union else 1.0
+    return {
+        "coverage": round(covered / len(corpus), 4) if corpus else 0.0,
+        "scored": scored,
+        "exact_match": round(exact / scored, 4) if scored else None,
+        "mean_jaccard": round(jacc / scored, 4) if scored else None,
+    }
+
+def peak_rss_mib():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+def worker(backend, batch, size, max_ai, q):
+    try:
+        corpus = load_corpus(size)
+        if backend == "zeroshot" and max_ai:
+            corpus = corpus[:max_ai]
+        reference = load_reference()
+        rss0 = peak_rss_mib()
+        t0 = time.perf_counter()
+        predicted, load_s = BACKENDS[backend](corpus, batch)
+        total = time.perf_counter() - t0
+        infer = max(total - load_s, 1e-9)
+        q.put({
+            "backend": backend,
+            "batch_size": batch if backend == "zeroshot" else None,
+            "papers": len(corpus),
+            "model_load_s": round(load_s, 3),
+            "infer_s": round(infer, 4),
+            "papers_per_s": round(len(corpus) / infer, 1),
+            "peak_rss_mib": round(peak_rss_mib(), 1),
+            "rss_growth_mib": round(peak_rss_mib() - rss0, 1),
+            **agreement(corpus, predicted, reference),
+        })
+    except Exception as e:
+        q.put({"backend": backend, "batch_size": batch, "error": f"{type(e).__name__}: {e}"})
+
+def collect(proc, q, backend, batch, timeout):
+    """The worker's result; an error entry if it dies without one or runs past `timeout`."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return q.get(timeout=1.0)
+        except queue.Empty:
+            pass
+        if not proc.is_alive():
+            try:
+                return q.get(timeout=1.0)    # put just before exiting
+            except queue.Empty:
+                return {"backend": backend, "batch_size": batch,
+                        "error": f"worker exited with code {proc.exitcode} and no result"}
+        if time.monotonic() > deadline:
+            proc.kill()
+            return {"backend": backend, "batch_size": batch, "error": f"timed out after {timeout:g}s"}
+
+# ---------- Main ----------
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark categorization backends.")
+    ap.add_argument("--backends", nargs="+", choices=list(BACKENDS), default=list(BACKENDS))
+    ap.add_argument("--size", type=int, default=2000, help="corpus size after synthetic scaling (0 = as-is)")
+    ap.add_argument("--batch-sizes", type=int, nargs="+", default=[ai.BATCH_SIZE], help="zero-shot batch sizes")
+    ap.add_argument("--max-ai", type=int, default=256, help="cap on papers sent through the zero-shot model (0 = no cap)")
+    ap.add_argument("--timeout", type=float, default=1800, help="per-run timeout in seconds")
+    ap.add_argument("--json", help="write results to this path")
+    args = ap.parse_args(argv)
+
+    runs = []
+    for b in args.backends:
+        if b == "zeroshot":
+            if not zeroshot_available():
+                print("[skip] zeroshot: transformers is not installed")
+                continue
+            runs.extend(("zeroshot", n) for n in args.batch_sizes)
+        else:
+            runs.append((b, None))
+
+    ctx = mp.get_context("spawn")
+    results = []
+    for backend, batch in runs:
+        q = ctx.Queue()
+        proc = ctx.Process(target=worker, args=(backend, batch, args.size, args.max_ai, q))
+        proc.start()
+        res = collect(proc, q, backend, batch, args.timeout)
+        proc.join()
+        results.append(res)
+        if "error" in res:
+            print(f"{backend:<9} batch={batch}  ERROR {res['error']}")
+            continue
+        tag = f"batch={batch}" if batch else ""
+        print(f"{backend:<9} {tag:<9} {res['papers']:>6} papers  {res['papers_per_s']:>10} p/s  "
+              f"load {res['model_load_s']:>6}s  {res['peak_rss_mib']:>7} MiB  "
+              f"cov {res['coverage']}  exact {res['exact_match']}  jacc {res['mean_jaccard']}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"params": vars(args), "results": results}, indent=2), encoding="utf-8")
+        print(f"[ok] wrote {args.json}")
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the sync tools.
+
+Starts one local HTTP server that stands in for every upstream the tools
+talk to (Semantic Scholar graph API + figures, SerpAPI, Unpaywall, doi.org
+and arXiv landing pages, open-access PDFs), builds a synthetic roster in a scratch copy of the
+site, then runs
+
+  - tools/s2_to_member_json.py
+  - tools/pdf_abstracts.py
+  - tools/build_highlights.py
+  - tools/fetch_scholar.py
+
+as subprocesses against it. For every roster size it reports wall time,
+stand-in request counts (per route) and the peak RSS of the child process.
+
+The stand-in can add latency, answer a fraction of requests with 429 and
+cap the page size of /author/{id}/papers. Responses are synthetic unless a
+recorded fixture exists for the request path (--fixtures, a JSON object
+mapping "/s2/paper/<id>" style paths to response bodies).
+
+Usage:
+  python tools/bench_sync.py                        # 10, 100, 1000 members
+  python tools/bench_sync.py --sizes 10 50 --latency-ms 20 --rate-429 0.02
+  python tools/bench_sync.py --json bench_output.json
+"""
+
+import argparse, hashlib, json, os, random, re, shutil, struct, subprocess, sys, tempfile, threading, time, zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+TOOLS = [
+    ("s2_to_member_json", "s2_to_member_json.py"),
+    ("pdf_abstracts", "pdf_abstracts.py"),
+    ("build_highlights", "build_highlights.py"),
+    ("fetch_scholar", "fetch_scholar.py"),
+]
+
+NOWYEAR = int(time.strftime("%Y"))
+
+# ---------- Synthetic upstream ----------
+def h(*parts):
+    return hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+def png(seed, size=64, cells=8):
+    """Grayscale PNG of noisy random blocks; the same seed gives the same picture."""
+    rng = random.Random(seed)
+    grid = [[rng.randrange(16, 240) for _ in range(cells)] for _ in range(cells)]
+    rows = b"".join(b"\0" + bytes(grid[y * cells // size][x * cells // size] + rng.randrange(-12, 13)
+                                   for x in range(size)) for y in range(size))
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 0, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b""))
+
+def pdf(seed, pad=512 * 1024):
+    """A pdfTeX-like file: page 1 text up front, then `pad` bytes of fonts/figures."""
+    line = f"report synthetic results on {h(seed)[:8]} photonic quantum information processing."
+    lines = ["BT /F1 12 Tf 72 720 Td (Synthetic title) Tj ET",
+             "BT /F2 9 Tf 72 690 Td [(Abstract)-333(\\227)-333(W)80(e)] TJ"]
+    lines += [f"0 -11 Td [({line})-250(W)80(e)] TJ" for _ in range(12)]
+    lines += ["ET", "BT /F1 10 Tf 72 500 Td (1 Introduction) Tj ET"]
+    content = zlib.compress("\n".join(lines).encode("latin-1"))
+    font = zlib.compress(random.Random(seed).randbytes(pad), 0)
+    return (b"%PDF-1.5\n%\xe4\xf0\xed\xf8\n"
+            + b"4 0 obj\n<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(content) + content + b"\nendstream\nendobj\n"
+            + b"9 0 obj\n<< /Length1 %d /Length %d /Filter /FlateDecode >>\nstream\n" % (pad, len(font)) + font
+            + b"\nendstream\nendobj\n%%EOF\n")
+
+class StandIn:
+    """Shared state for the stand-in server: knobs, fixtures and counters."""
+
+    def __init__(self, papers_per_author=40, page_size=100, latency_ms=0.0,
+                 rate_429=0.0, figure_hit=0.5, fixtures=None, seed=0):
+        self.papers_per_author = papers_per_author
+        self.page_size = page_size
+        self.latency = latency_ms / 1000.0
+        self.rate_429 = rate_429
+        self.figure_hit = figure_hit
+        self.fixtures = fixtures or {}
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = Counter()
+        self.bytes_out = 0
+
+    def reset(self):
+        with self.lock:
+            self.counts.clear()
+            self.bytes_out = 0
+
+    def roll_429(self):
+        if self.rate_429 <= 0: return False
+        with self.lock:
+            return self.rng.random() < self.rate_429
+
+    # Papers are shared between neighbouring authors so the dedupe and
+    # highlights de-dupe paths see realistic overlap.
+    def author_papers(self, aid, base):
+        aid = int(aid)
+        out = []
+        for i in range(self.papers_per_author):
+            owner = aid - 1 if (i % 5 == 0 and aid > 0) else aid
+            pid = h("paper", owner, i)
+            year = NOWYEAR - (i % 4)
+            out.append({
+                "paperId": pid,
+                "title": f"Synthetic paper {owner}-{i} on photonic quantum information",
+                "year": year,
+                "venue": ["Physical Review A", "Optica", "arXiv.org", ""][i % 4],
+                "url": f"https://www.semanticscholar.org/paper/{pid}",
+                "externalIds": ({"DOI": f"10.5555/syn.{owner}.{i}"} if i % 3 else {"ArXiv": f"{NOWYEAR % 100:02d}01.{owner:05d}"}),
+                "authors": [{"authorId": str(owner), "name": f"Member {owner}"},
+                            {"authorId": str(owner + 1), "name": f"Member {owner + 1}"},
+                            {"authorId": None, "name": f"External {i}"}],
+                "openAccessPdf": {"url": f"{base}/pdf/{pid}.pdf"} if i % 2 else None,
+            })
+        return out
+
+    def paper_details(self, pid):
+        n = int(pid[:2], 16)
+        if n % 3 == 0:
+            return {"paperId": pid, "abstract": "We study synthetic photonic systems. " * 20,
+                    "topics": [], "fieldsOfStudy": ["Physics"]}
+        if n % 3 == 1:
+            return {"paperId": pid, "abstract": None, "topics": [], "fieldsOfStudy": ["Physics"]}
+        return {"paperId": pid, "abstract": None,
+                "topics": [{"topic": "Quantum information"}, {"topic": "Optics"}],
+                "fieldsOfStudy": ["Physics"]}
+
+    def scholar_author(self, user, num):
+        arts = [{"title": f"Scholar article {user}-{i}", "link": f"https://example.org/{user}/{i}",
+                 "publication": "Optica", "year": str(NOWYEAR - i % 4)} for i in range(num)]
+        return {"search_metadata": {"status": "Success"}, "author": {"name": user}, "articles": arts}
+
+    def landing(self, key, base):
+        # A third of landings advertise a generic publisher logo, which the
+        # highlights tool has to reject by URL before it falls back to
+        # figures; another sixth serve one shared journal cover from
+        # per-paper URLs, which only the image check catches.
+        n = int(h(key)[:2], 16)
+        img = (f"{base}/img/logo.png" if n % 3 == 0 else
+               f"{base}/img/cover/{h(key)[:12]}.png" if n % 6 == 1 else f"{base}/img/{h(key)[:12]}.png")
+        return ("<!doctype html><html><head>"
+                f'<meta property="og:image" content="{img}">'
+                f"<title>{key}</title></head><body>{'<p>lorem ipsum</p>' * 200}</body></html>")
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; without this, keep-alive
+        # clients stall on delayed ACKs and the stand-in dominates wall time.
+        disable_nagle_algorithm = True
+
+        def log_message(self, *a):
+            pass
+
+        def route(self):
+            path = urlparse(self.path).path
+            parts = [p for p in path.split("/") if p]
+            if not parts: return "root"
+            if parts[0] == "s2" and len(parts) >= 4 and parts[1] == "author": return "s2.author_papers"
+            if parts[0] == "s2" and len(parts) >= 3 and parts[1] == "paper": return "s2.paper"
+            return {"serpapi": "serpapi", "unpaywall": "unpaywall", "doi": "doi", "arxiv": "arxiv",
+                    "figures": "s2.figures", "img": "img", "pdf": "pdf"}.get(parts[0], "other")
+
+        def send(self, code, body=b"", ctype="application/json", head_only=False, length=None):
+            self.send_response(code)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(length if length is not None else len(body)))
+            self.end_headers()
+            if not head_only and body:
+                self.wfile.write(body)
+            with state.lock:
+                state.bytes_out += 0 if head_only else len(body)
+
+        def handle_any(self, head_only=False):
+            name = self.route()
+            with state.lock:
+                state.counts[name] += 1
+            if state.latency:
+                time.sleep(state.latency)
+            if state.roll_429():
+                with state.lock:
+                    state.counts["429"] += 1
+                return self.send(429, b'{"message":"Too Many Requests"}', head_only=head_only)
+
+            u = urlparse(self.path)
+            path, q = unquote(u.path), parse_qs(u.query)
+            base = f"http://{self.headers.get('Host')}"
+            if path in state.fixtures:
+                return self.send(200, json.dumps(state.fixtures[path]).encode("utf-8"), head_only=head_only)
+
+            parts = [p for p in path.split("/") if p]
+            if name == "s2.author_papers":
+                items = state.author_papers(parts[2], base)
+                limit = min(int((q.get("limit") or ["100"])[0]), state.page_size)
+                offset = int((q.get("offset") or ["0"])[0])
+                page = items[offset:offset + limit]
+                body = {"offset": offset, "data": page}
+                if offset + limit < len(items): body["next"] = offset + limit
+                return self.send(200, json.dumps(body).encode("utf-8"), head_only=head_only)
+            if name == "s2.paper":
+                return self.send(200, json.dumps(state.paper_details(parts[2])).encode("utf-8"), head_only=head_only)
+            if name == "serpapi":
+                user = (q.get("author_id") or [""])[0]
+                num = int((q.get("num") or ["10"])[0])
+                return self.send(200, json.dumps(state.scholar_author(user, num)).encode("utf-8"), head_only=head_only)
+            if name == "unpaywall":
+                doi = "/".join(parts[2:])
+                body = {"doi": doi, "best_oa_location": {"url": f"{base}/arxiv/abs/{h(doi)[:10]}"}}
+                return self.send(200, json.dumps(body).encode("utf-8"), head_only=head_only)
+            if name in ("doi", "arxiv"):
+                return self.send(200, state.landing(path, base).encode("utf-8"), "text/html", head_only=head_only)
+            if name == "s2.figures":
+                hit = int(h(path)[:2], 16) < 256 * state.figure_hit
+                if not hit:
+                    return self.send(404, b"", head_only=head_only)
+                return self.send(200, png(path, 96), "image/png", head_only=head_only)
+            if name == "pdf":
+                body = pdf(path)
+                m = re.match(r"bytes=(\d+)-(\d*)$", self.headers.get("Range") or "")
+                if m:
+                    lo = int(m.group(1)); hi = min(int(m.group(2) or len(body) - 1), len(body) - 1)
+                    return self.send(206, body[lo:hi + 1], "application/pdf", head_only=head_only)
+                return self.send(200, body, "application/pdf", head_only=head_only)
+            if name == "img":
+                seed = "cover" if parts[1:2] == ["cover"] else path
+                return self.send(200, png(seed), "image/png", head_only=head_only)
+            return self.send(404, b"", head_only=head_only)
+
+        def do_GET(self):
+            self.handle_any()
+
+        def do_HEAD(self):
+            self.handle_any(head_only=True)
+
+    return Handler
+
+
+def start_server(state):
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(state))
+    srv.daemon_threads = True
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv, f"http://127.0.0.1:{srv.server_address[1]}"
+
+# ---------- Synthetic site ----------
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+def build_site(dest, n_members):
+    """Scratch site root: a copy of tools/ plus a synthetic members/ roster."""
+    shutil.copytree(HERE, os.path.join(dest, "tools"),
+                    ignore=shutil.ignore_patterns("__pycache__", "*.pyc"))
+    os.makedirs(os.path.join(dest, "data"), exist_ok=True)
+    ids = [f"m{i:04d}" for i in range(n_members)]
+    write_json(os.path.join(dest, "members", "manifest.json"), ids)
+    for i, mid in enumerate(ids):
+        write_json(os.path.join(dest, "members", mid, "profile.json"), {
+            "id": mid,
+            "name": f"Member {i}",
+            "semanticScholarId": str(i),
+            "scholarUser": f"user{i:04d}",
+        })
+    return ids
+
+def tool_env(base):
+    env = dict(os.environ)
+    env.update({
+        "S2_API_BASE": f"{base}/s2",
+        "SERPAPI_BASE": f"{base}/serpapi/search.json",
+        "SERPAPI_KEY": "bench",
+        "UNPAYWALL_BASE": f"{base}/unpaywall/v2",
+        "UNPAYWALL_EMAIL": "bench@example.org",
+        "DOI_BASE": f"{base}/doi",
+        "ARXIV_BASE": f"{base}/arxiv",
+        "S2_FIGURES_BASE": f"{base}/figures",
+        "NO_PROXY": "127.0.0.1,localhost",
+        # Anything not routed to the stand-in (e.g. https://doi.org links the
+        # tools build themselves) fails fast instead of leaving the sandbox.
+        "HTTPS_PROXY": "http://127.0.0.1:9",
+        "HTTP_PROXY": "http://127.0.0.1:9",
+    })
+    return env
+
+def run_tool(script, cwd, env, timeout):
+    """Run one tool; return (wall seconds, exit code, peak RSS in MiB, tail of stderr)."""
+    t0 = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, script], cwd=cwd, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    killer = threading.Timer(timeout, proc.kill)
+    killer.start()
+    try:
+        err = proc.stderr.read()
+        _, status, ru = os.wait4(proc.pid, 0)
+    finally:
+        killer.cancel()
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    wall = time.perf_counter() - t0
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = ru.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    tail = err.decode("utf-8", "replace").strip().splitlines()[-3:]
+    return wall, proc.returncode, rss, tail
+
+# ---------- Main ----------
+def bench(args):
+    fixtures = {}
+    if args.fixtures:
+        with open(args.fixtures, "r", encoding="utf-8") as f:
+            fixtures = json.load(f)
+    state = StandIn(papers_per_author=args.papers, page_size=args.page_size,
+                    latency_ms=args.latency_ms, rate_429=args.rate_429,
+                    figure_hit=args.figure_hit, fixtures=fixtures, seed=args.seed)
+    srv, base = start_server(state)
+    env = tool_env(base)
+    results = []
+    try:
+        for size in args.sizes:
+            with tempfile.TemporaryDirectory(prefix="pquip-bench-") as tmp:
+                build_site(tmp, size)
+                for name, script in TOOLS:
+                    if args.only and name not in args.only: continue
+                    state.reset()
+                    wall, code, rss, tail = run_tool(os.path.join("tools", script), tmp, env, args.timeout)
+                    with state.lock:
+                        counts = dict(state.counts)
+                        nbytes = state.bytes_out
+                    row = {
+                        "tool": name,
+                        "members": size,
+                        "wall_s": round(wall, 3),
+                        "exit": code,
+                        "peak_rss_mib": round(rss, 1),
+                        "requests": sum(v for k, v in counts.items() if k != "429"),
+                        "responses_429": counts.get("429", 0),
+                        "bytes_served": nbytes,
+                        "by_route": {k: v for k, v in sorted(counts.items()) if k != "429"},
+                    }
+                    if code != 0: row["stderr"] = tail
+                    results.append(row)
+                    print(f"{name:<20} {size:>6} members  {wall:8.2f}s  {row['requests']:>7} req  "
+                          f"{row['responses_429']:>5} x429  {rss:7.1f} MiB  exit={code}", flush=True)
+    finally:
+        srv.shutdown()
+
+    if args.json:
+        write_json(args.json, {
+            "python": sys.version.split()[0],
+            "params": {k: v for k, v in vars(args).items() if k != "json"},
+            "results": results,
+        })
+        print(f"wrote {args.json}")
+    return results
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark the sync tools against local stand-in servers.")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="roster sizes to run")
+    ap.add_argument("--papers", type=int, default=40, help="papers per synthetic author")
+    ap.add_argument("--page-size", type=int, default=100, help="max items per /author/{id}/papers page (the tool follows `next`, so smaller pages mean more requests)")
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="added latency per request")
+    ap.add_argument("--rate-429", type=float, default=0.0, help="fraction of requests answered with 429")
+    ap.add_argument("--figure-hit", type=float, default=0.5, help="fraction of S2 figure probes that exist")
+    ap.add_argument("--fixtures", help="JSON object of recorded responses keyed by request path")
+    ap.add_argument("--only", nargs="+", choices=[t[0] for t in TOOLS], help="run only these tools")
+    ap.add_argument("--timeout", type=float, default=1800, help="per-tool timeout in seconds")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", help="write results to this path")
+    return ap.parse_args(argv)
+
+def main(argv=None):
+    return bench(parse_args(argv))
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
-import os, json, time, re
+import argparse, os, json, time, re
 from glob import glob
 from urllib.parse import urljoin, urlparse, quote
-import requests
-from bs4 import BeautifulSoup
+import runlog
+from checkpoint import Journal, NullJournal
+from publication import Corpus
 
 ROOT = os.path.dirname(os.path.dirname(__file__))
 MEMBERS_DIR = os.path.join(ROOT, "members")
@@ -16,8 +17,23 @@ USER_AGENT = ("Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
 TIMEOUT = 18
 UNPAYWALL_EMAIL = os.environ.get("UNPAYWALL_EMAIL", "").strip()
 
-session = requests.Session()
-session.headers.update({"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"})
+# Upstream endpoints; overridable so the tools can run against local stand-ins
+DOI_BASE = os.environ.get("DOI_BASE", "https://doi.org").rstrip("/")
+UNPAYWALL_BASE = os.environ.get("UNPAYWALL_BASE", "https://api.unpaywall.org/v2").rstrip("/")
+ARXIV_BASE = os.environ.get("ARXIV_BASE", "https://arxiv.org").rstrip("/")
+S2_FIGURES_BASE = os.environ.get("S2_FIGURES_BASE", "https://figures.semanticscholar.org").rstrip("/")
+
+# requests/bs4 are imported on first use so importing this module stays cheap
+_session = None
+
+def get_session():
+    global _session
+    if _session is None:
+        import requests
+        s = runlog.instrument(requests.Session())
+        s.headers.update({"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"})
+        _session = s
+    return _session
 
 # ---------- Utilities ----------
 def read_json(path):
@@ -49,7 +65,9 @@ def is_generic_image(img_url):
         return True
     return False
 
+@runlog.span("og.parse")
 def extract_og_image(html, base_url):
+    from bs4 import BeautifulSoup
     soup = BeautifulSoup(html, "html.parser")
     candidates = []
     for key in ("og:image", "og:image:url", "og:image:secure_url"):
@@ -68,14 +86,15 @@ def extract_og_image(html, base_url):
         return urljoin(base_url, candidates[0])
     return None
 
-def doi_url(doi): return f"https://doi.org/{doi}"
+def doi_url(doi): return f"{DOI_BASE}/{doi}"
 
+@runlog.span("unpaywall")
 def unpaywall_best_landing(doi):
     if not UNPAYWALL_EMAIL or not doi:
         return None
     try:
-        api = f"https://api.unpaywall.org/v2/{quote(doi)}?email={quote(UNPAYWALL_EMAIL)}"
-        r = session.get(api, timeout=TIMEOUT)
+        api = f"{UNPAYWALL_BASE}/{quote(doi)}?email={quote(UNPAYWALL_EMAIL)}"
+        r = get_session().get(api, timeout=TIMEOUT)
         if not r.ok: return None
         j = r.json()
         loc = j.get("best_oa_location") or {}
@@ -83,11 +102,13 @@ def unpaywall_best_landing(doi):
     except Exception:
         return None
 
-def arxiv_abs(arxiv_id): return f"https://arxiv.org/abs/{arxiv_id}"
+def arxiv_abs(arxiv_id): return f"{ARXIV_BASE}/abs/{arxiv_id}"
 
 def fetch_og_from(url):
+    import requests
     try:
-        r = session.get(url, timeout=TIMEOUT, allow_redirects=True)
+        with runlog.span("og.fetch"):
+            r = get_session().get(url, timeout=TIMEOUT, allow_redirects=True)
         if not r.ok or not r.text:
             return None, r.url if hasattr(r, "url") else url
         img = extract_og_image(r.text, r.url)
@@ -96,6 +117,7 @@ def fetch_og_from(url):
         return None, url
 
 # ---------- Semantic Scholar figures hack ----------
+@runlog.span("figures.probe")
 def probe_semantic_scholar_figure(paper_id):
     """
     Try a handful of predictable figure URLs. Return the first that exists (HTTP 200).
@@ -104,15 +126,16 @@ def probe_semantic_scholar_figure(paper_id):
     """
     if not paper_id:
         return None
+    import requests
     bases = [
-        f"https://figures.semanticscholar.org/{paper_id}/500px/3-Figure{{n}}-1.png",
-        f"https://figures.semanticscholar.org/{paper_id}/500px/1-Figure{{n}}-1.png",
+        f"{S2_FIGURES_BASE}/{paper_id}/500px/3-Figure{{n}}-1.png",
+        f"{S2_FIGURES_BASE}/{paper_id}/500px/1-Figure{{n}}-1.png",
     ]
     for n in range(1, 9):  # try first 8 figures
         for base in bases:
             url = base.format(n=n)
             try:
-                r = session.head(url, timeout=10, allow_redirects=True)
+                r = get_session().head(url, timeout=10, allow_redirects=True)
                 if r.ok and int(r.headers.get("Content-Length", "1")) > 1000:
                     return url
             except requests.RequestException:
@@ -120,14 +143,15 @@ def probe_semantic_scholar_figure(paper_id):
     return None
 
 # ---------- Collect & build ----------
-def collect_this_year_pubs():
-    items = []
+def iter_member_pubs():
     for pubfile in glob(os.path.join(MEMBERS_DIR, "*", "publications.json")):
         data = read_json(pubfile)
         arr = data if isinstance(data, list) else (data or {}).get("publications") or []
-        for p in arr:
-            if p.get("year") != NOWYEAR: continue
-            items.append(p)
+        yield from arr
+
+def collect_this_year_pubs(pubs=None):
+    corpus = pubs if isinstance(pubs, Corpus) else Corpus.from_dicts(iter_member_pubs() if pubs is None else pubs)
+    items = corpus.with_year(NOWYEAR)
     # de-dupe by DOI or title/url
     seen, uniq = set(), []
     for p in items:
@@ -136,33 +160,73 @@ def collect_this_year_pubs():
             seen.add(key); uniq.append(p)
     return uniq
 
-def choose_best_image(pub):
+def image_candidates(pub, journal=None):
+    """Candidate images for a publication, best first: (url, source)."""
+    # Lookups go through the journal so a resumed run does not repeat them.
+    # A figure probe that finds nothing records "" so it is not re-probed.
+    journal = journal or NullJournal()
     # 1) landings with OG images
     attempts = []
     if pub.get("doi"): attempts.append(doi_url(pub["doi"]))
     if pub.get("doi"):
-        u = unpaywall_best_landing(pub["doi"])
+        u = journal.memo("unpaywall", pub["doi"], lambda: unpaywall_best_landing(pub["doi"]))
         if u: attempts.append(u)
     if pub.get("arxivId"): attempts.append(arxiv_abs(pub["arxivId"]))
     if pub.get("url"): attempts.append(pub["url"])
 
     for u in attempts:
-        img, _ = fetch_og_from(u)
+        img = journal.memo("og", u, lambda: fetch_og_from(u)[0])
         if img and not is_generic_image(img):
-            return img
+            yield img, "og"
 
     # 2) Semantic Scholar figures via paperId (hack)
-    img = probe_semantic_scholar_figure(pub.get("paperId"))
-    if img: return img
+    if pub.get("paperId"):
+        img = journal.memo("figure", pub["paperId"],
+                           lambda: probe_semantic_scholar_figure(pub["paperId"]) or "")
+        if img:
+            yield img, "s2_figure"
+
+def choose_images(pubs, check_images=True, journal=None):
+    """
+    First candidate per publication; with check_images, candidates that the
+    pixel check calls generic, or that an earlier paper already shows, are
+    replaced by the paper's next candidate until every choice passes.
+    """
+    journal = journal or NullJournal()
+    gens = [image_candidates(p, journal) for p in pubs]
+    chosen = [next(g, None) for g in gens]
+    if check_images:
+        from image_dedupe import ImageChecker
+        checker = ImageChecker.load(get_session())
+        checker.cache.update(journal.items("hash"))
+        pending = True
+        while pending:
+            before = set(checker.cache)
+            with runlog.span("images.check"):
+                idx = [i for i, c in enumerate(chosen) if c]
+                verdicts = dict(zip(idx, checker.check([(i, chosen[i][0]) for i in idx])))
+            for u in set(checker.cache) - before:
+                journal.record("hash", u, checker.cache[u])
+            pending = [i for i in idx if verdicts[i] in ("generic", "duplicate")]
+            for i in pending:
+                runlog.count(f"image.rejected.{verdicts[i]}")
+                chosen[i] = next(gens[i], None)
+        checker.save()
 
     # 3) Fallback
-    return PLACEHOLDER
+    out = []
+    for c in chosen:
+        runlog.count(f"image.{c[1] if c else 'placeholder'}")
+        out.append(c[0] if c else PLACEHOLDER)
+    return out
 
-def build():
-    pubs = collect_this_year_pubs()
+def build(pubs=None, check_images=True, resume=False):
+    journal = Journal("build_highlights", resume=resume)
+    with runlog.span("collect"):
+        pubs = collect_this_year_pubs(pubs)
+    images = choose_images(pubs, check_images, journal)
     out = []
-    for p in pubs:
-        img = choose_best_image(p)
+    for p, img in zip(pubs, images):
         url = (f"https://doi.org/{p['doi']}" if p.get("doi") else (p.get("url") or ""))
         out.append({
             "type": "publication",
@@ -180,6 +244,18 @@ def build():
     }
     write_json(OUT, payload)
     print(f"Wrote {os.path.relpath(OUT, ROOT)} with {len(out)} items.")
+    journal.complete()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Build the homepage publication highlights.")
+    ap.add_argument("--resume", action="store_true",
+                    help="continue a failed run: reuse its landing, figure and image lookups")
+    ap.add_argument("--no-image-check", action="store_true", help="skip the perceptual-hash image check")
+    args = ap.parse_args(argv)
+    build(check_images=not args.no_image_check, resume=args.resume)
 
 if __name__ == "__main__":
-    build()
+    try:
+        main()
+    finally:
+        runlog.write_report("build_highlights")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Append-only checkpoint journal for long-running tools.
+
+Each completed unit of work (an author page, a paperId's details, an OG
+image lookup, a finished member) is appended to
+data/_checkpoints/<tool>.jsonl as one line and flushed immediately, so a
+crash or a CI timeout loses at most the unit in flight. With resume=True
+the journal of the previous run is replayed and recorded units are not
+redone; without it the journal starts empty. A run that finishes calls
+complete(), which deletes the journal.
+
+  journal = checkpoint.Journal("s2_to_member_json", resume=args.resume)
+  data = journal.memo("page", f"{aid}:{offset}", lambda: fetch(...))
+  journal.complete()
+
+Journals older than MAX_AGE_S are not resumed: their responses are stale.
+"""
+
+import json, os, threading, time
+
+import runlog
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CHECKPOINT_DIR = os.environ.get("CHECKPOINT_DIR") or os.path.join(ROOT, "data", "_checkpoints")
+MAX_AGE_S = 2 * 24 * 3600
+
+class Journal:
+    def __init__(self, name, resume=False, directory=CHECKPOINT_DIR):
+        self.path = os.path.join(directory, f"{name}.jsonl")
+        self.units = {}             # (kind, key) -> value
+        self._lock = threading.Lock()
+        created = None
+        if resume:
+            created = self._replay()
+        os.makedirs(directory, exist_ok=True)
+        if created is None:
+            self._f = open(self.path, "w", encoding="utf-8")
+            self._write({"journal": name, "created": int(time.time())})
+        else:
+            self._f = open(self.path, "a", encoding="utf-8")
+            print(f"[resume] {name}: {len(self.units)} units from {os.path.relpath(self.path, ROOT)}")
+        runlog.count("checkpoint.replayed", len(self.units))
+
+    def _replay(self):
+        """Load units from an existing journal; returns its creation time or None."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return None
+        created = None
+        for i, line in enumerate(lines):
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue            # torn last line from a killed run
+            if i == 0:
+                created = rec.get("created")
+                if not created or time.time() - created > MAX_AGE_S:
+                    return None
+                continue
+            self.units[(rec["kind"], rec["key"])] = rec.get("value")
+        return created
+
+    def _write(self, rec):
+        self._f.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._f.flush()
+
+    def done(self, kind, key):
+        return (kind, str(key)) in self.units
+
+    def get(self, kind, key, default=None):
+        return self.units.get((kind, str(key)), default)
+
+    def items(self, kind):
+        """{key: value} of every recorded unit of one kind."""
+        return {k: v for (t, k), v in self.units.items() if t == kind}
+
+    def record(self, kind, key, value=None):
+        with self._lock:
+            self.units[(kind, str(key))] = value
+            self._write({"kind": kind, "key": str(key), "value": value})
+
+    def memo(self, kind, key, fn):
+        """
+        fn() unless (kind, key) is recorded. None results are not recorded:
+        the tools return None for transient failures too, and those should
+        be retried on resume.
+        """
+        if self.done(kind, key):
+            runlog.cache(f"checkpoint.{kind}", hit=True)
+            return self.get(kind, key)
+        runlog.cache(f"checkpoint.{kind}", hit=False)
+        value = fn()
+        if value is not None:
+            self.record(kind, key, value)
+        return value
+
+    def complete(self):
+        """The run finished: nothing to resume, drop the journal."""
+        self._f.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def close(self):
+        self._f.close()
+
+class NullJournal(Journal):
+    """Same interface, nothing written to disk (callers that do not checkpoint)."""
+
+    def __init__(self):
+        self.units = {}
+        self._lock = threading.Lock()
+
+    def _write(self, rec):
+        pass
+
+    def complete(self):
+        pass
+
+    def close(self):
+        pass
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Command line front end for the tools.
+
+  python -m tools sync             # S2 -> members/*/publications.json
+  python -m tools scholar          # SerpAPI -> members/*/scholar.json
+  python -m tools abstracts        # -> data/pdf_abstracts.json
+  python -m tools classify         # -> data/publication_categories*.json
+  python -m tools highlights       # -> data/highlights.auto.json
+  python -m tools related          # -> data/publications.related.json
+  python -m tools collab           # -> data/collaboration.json
+  python -m tools pipeline [...]   # the whole DAG (tools/pipeline.py)
+  python -m tools bench-sync [...] / bench-classify [...]
+  python -m tools startup          # import-time budget check
+
+Only the module behind the chosen subcommand is imported, and those modules
+defer requests, bs4 and transformers until a code path needs them, so e.g.
+a classify run that is fully resolved by overrides/topics never loads torch.
+"""
+
+import importlib, json, os, subprocess, sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
+
+# subcommand -> (module, entry point, run-report name or None, help)
+COMMANDS = {
+    "sync":           ("s2_to_member_json", "main", "s2_to_member_json", "fetch Semantic Scholar publications"),
+    "scholar":        ("fetch_scholar", "main", "fetch_scholar", "fetch Google Scholar (SerpAPI) publications"),
+    "abstracts":      ("pdf_abstracts", "main", "pdf_abstracts", "first-page abstracts from open-access PDFs"),
+    "classify":       ("ai_classify_categories", "main", "ai_classify_categories", "categorize publications"),
+    "highlights":     ("build_highlights", "main", "build_highlights", "build homepage highlights"),
+    "related":        ("related", "main", None, "related publications (TF-IDF top-k)"),
+    "collab":         ("coauthors", "main", None, "co-authorship graph and collaboration metrics"),
+    "members":        ("render_members", "main", None, "prerender static member pages"),
+    "site":           ("assemble_site", "main", None, "inline partials/critical CSS into pages"),
+    "pipeline":       ("pipeline", "main", None, "run the whole pipeline DAG"),
+    "bench-sync":     ("bench_sync", "main", None, "offline benchmark of the sync tools"),
+    "bench-classify": ("bench_classify", "main", None, "benchmark the categorization backends"),
+}
+
+# Modules a plain import of any tool must not pull in.
+HEAVY = ("requests", "bs4", "transformers", "torch", "numpy", "scipy")
+STARTUP_MODULES = ("runlog", "s2_to_member_json", "fetch_scholar", "pdf_abstracts",
+                   "ai_classify_categories", "build_highlights", "pipeline")
+STARTUP_BUDGET_MS = 150
+
+def check_startup(budget_ms=STARTUP_BUDGET_MS):
+    """Import every tool module in a fresh interpreter; fail if slow or heavy."""
+    code = (
+        "import json, sys, time\n"
+        f"sys.path.insert(0, {HERE!r})\n"
+        "t = time.perf_counter()\n"
+        f"for m in {STARTUP_MODULES!r}: __import__(m)\n"
+        "dt = (time.perf_counter() - t) * 1000\n"
+        f"heavy = [m for m in {HEAVY!r} if m in sys.modules]\n"
+        "print(json.dumps({'ms': dt, 'heavy': heavy}))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    res = json.loads(out.stdout)
+    print(f"import {len(STARTUP_MODULES)} modules: {res['ms']:.1f} ms (budget {budget_ms} ms)")
+    ok = True
+    if res["heavy"]:
+        print(f"ERROR: heavy modules imported at import time: {', '.join(res['heavy'])}", file=sys.stderr)
+        ok = False
+    if res["ms"] > budget_ms:
+        print("ERROR: import time over budget", file=sys.stderr)
+        ok = False
+    return ok
+
+def usage():
+    print("usage: python -m tools <command> [args]\n")
+    for name, (_, _, _, text) in COMMANDS.items():
+        print(f"  {name:<15} {text}")
+    print(f"  {'startup':<15} check import time of the tools (--budget-ms N)")
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] in ("-h", "--help", "help"):
+        usage()
+        return
+    cmd, rest = argv[0], argv[1:]
+
+    if cmd == "startup":
+        budget = STARTUP_BUDGET_MS
+        if rest[:1] == ["--budget-ms"] and len(rest) > 1:
+            budget = float(rest[1])
+        sys.exit(0 if check_startup(budget) else 1)
+
+    if cmd not in COMMANDS:
+        print(f"unknown command: {cmd}\n", file=sys.stderr)
+        usage()
+        sys.exit(2)
+
+    module, entry, report, _ = COMMANDS[cmd]
+    mod = importlib.import_module(module)
+    fn = getattr(mod, entry)
+    if report is None:
+        # These parse their own arguments.
+        return fn(rest)
+    sys.argv = [f"tools {cmd}"] + rest
+    import runlog
+    try:
+        fn()
+    finally:
+        runlog.write_report(report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Co-authorship graph and collaboration metrics.
+
+Authors are interned to integer node ids (group members by member id via
+attribution.AuthorIndex, everyone else by folded name, with spellings that
+share an unambiguous initial+surname key merged: "F. Bouchard" and
+"Frédéric Bouchard" are one node unless another Bouchard F. appears
+with a different given name), papers x authors
+becomes a sparse incidence matrix B, and the weighted co-author adjacency
+is A = B.T @ B with the diagonal cleared. All metrics are sparse matrix
+products / row slices, so there are no pairwise Python loops.
+
+Writes data/collaboration.json:
+
+  {
+    "nodes": ..., "edges": ...,
+    "members": {
+      "<id>": {
+        "papers": 12, "collaborators": 40, "coauthorships": 75,
+        "internal": {"<other id>": 5, ...},          # shared papers
+        "top_external": [["Name", 4], ...],
+        "by_year": {"2024": [papers, collaborators, new_collaborators], ...},
+        "growth": {"2024": 0.25, ...}                 # collaborators vs previous calendar year
+      }
+    }
+  }
+
+Usage:
+  python tools/coauthors.py [--top 10]
+"""
+
+import argparse, json, os, sys, time
+
+import numpy as np
+import scipy.sparse as sp
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+from attribution import AuthorIndex, name_keys
+from publication import Corpus
+
+OUT = os.path.join(ROOT, "data", "collaboration.json")
+TOP_EXTERNAL = 10
+
+class Graph:
+    def __init__(self, B, labels, member_ids, years):
+        self.B = B                          # papers x nodes incidence (CSR, float32)
+        self.labels = labels                # node -> display name / member id
+        self.member_ids = member_ids        # node -> member id or None
+        self.years = years                  # paper -> year (0 = unknown)
+        self.is_member = np.array([m is not None for m in member_ids], dtype=bool)
+        A = (B.T @ B).tocsr()
+        A.setdiag(0)
+        A.eliminate_zeros()
+        self.A = A
+
+def external_keys(names):
+    """
+    ({name: node key}, {node key: label}) for non-member author strings
+    (names -> occurrence counts). Spellings are grouped
+    by attribution.name_keys' initial+surname key; a group whose spelled-out
+    given names all agree ("f bouchard": Frédéric, F.) becomes one node,
+    labelled with its most common full spelling. Groups with two different
+    given names ("d james": David, Daniel) keep one node per folded name.
+    """
+    groups = {}
+    for a, n in names.items():
+        full, weak = name_keys(a)
+        if not full: continue
+        groups.setdefault(weak[-1] if weak else full, []).append((a, full, n))
+    out, label = {}, {}
+    for first, spellings in groups.items():
+        given = {full.split()[0] for _, full, _ in spellings if len(full.split()[0]) > 1}
+        if len(given) > 1 or len(spellings) == 1:
+            for a, full, _ in spellings:
+                out[a] = full
+            continue
+        best = max(spellings, key=lambda t: (len(t[1].split()[0]) > 1, t[2], t[0]))
+        for a, _, _ in spellings:
+            out[a] = first
+        label[first] = best[0]
+    return out, label
+
+def build_graph(corpus, index):
+    """corpus: a publication.Corpus or publication dicts (optionally carrying `members` from pipeline.load_corpus)."""
+    if not isinstance(corpus, Corpus):
+        corpus = Corpus.from_dicts(corpus)
+    node_of, labels, member_ids = {}, [], []
+    resolved, external = {}, {}
+    rows, cols = [], []
+
+    for p in corpus:
+        for a in p.get("authors") or []:
+            if a in resolved:
+                if resolved[a] is None: external[a] += 1
+                continue
+            mid = index.lookup(a)
+            resolved[a] = f"@{mid}" if mid else None
+            if not mid: external[a] = 1
+    keys, merged_label = external_keys(external)
+    for a in external:
+        resolved[a] = keys.get(a)
+
+    def node(key, label, mid):
+        j = node_of.get(key)
+        if j is None:
+            j = node_of[sys.intern(key)] = len(labels)
+            labels.append(label)
+            member_ids.append(mid)
+        return j
+
+    for i, p in enumerate(corpus):
+        seen = set()
+        for a in p.get("authors") or []:
+            key = resolved[a]
+            if not key: continue
+            if key[0] == "@":
+                j = node(key, key[1:], key[1:])
+            else:
+                j = node(key, merged_label.get(key, a), None)
+            if j not in seen:
+                seen.add(j); rows.append(i); cols.append(j)
+        # Members whose S2 feed listed the paper are authors even if their
+        # name string did not resolve.
+        for mid in p.get("members") or []:
+            j = node(f"@{mid}", mid, mid)
+            if j not in seen:
+                seen.add(j); rows.append(i); cols.append(j)
+
+    B = sp.csr_matrix((np.ones(len(rows), dtype=np.float32), (np.array(rows, dtype=np.int32), np.array(cols, dtype=np.int32))),
+                      shape=(len(corpus), len(labels)))
+    return Graph(B, labels, member_ids, np.array(corpus.years, dtype=np.int32))
+
+def yearly(g, members):
+    """{year: (papers[m], collaborators[m], new[m])} for member node ids `members`."""
+    out = {}
+    seen = sp.csr_matrix((len(members), g.B.shape[1]), dtype=bool)
+    self_mask = sp.csr_matrix((np.ones(len(members), dtype=bool), (np.arange(len(members)), members)),
+                              shape=seen.shape)
+    for y in np.unique(g.years):
+        if y == 0: continue
+        By = g.B[g.years == y]
+        C = (By[:, members].T @ By).astype(bool)
+        C = C - C.multiply(self_mask)                  # drop self
+        new = C - C.multiply(seen)
+        seen = seen + C
+        out[int(y)] = (np.asarray(By[:, members].sum(axis=0)).ravel().astype(int),
+                       np.asarray(C.sum(axis=1)).ravel().astype(int),
+                       np.asarray(new.sum(axis=1)).ravel().astype(int))
+    return out
+
+def metrics(g, top=TOP_EXTERNAL):
+    members = np.flatnonzero(g.is_member)
+    papers = np.asarray(g.B[:, members].sum(axis=0)).ravel().astype(int)
+    per_year = yearly(g, members)
+    out = {}
+    for k, m in enumerate(members):
+        row = g.A.getrow(m)
+        idx, w = row.indices, row.data.astype(int)
+        internal = g.is_member[idx]
+        ext_idx, ext_w = idx[~internal], w[~internal]
+        order = np.argsort(-ext_w, kind="stable")[:top]
+        active = [y for y, (yp, yc, _) in per_year.items() if yp[k] or yc[k]]
+        by_year, growth, prev = {}, {}, None
+        # Every calendar year from the first active one to the last; an
+        # inactive year counts as 0 collaborators for the next year's growth.
+        for y in range(min(active), max(active) + 1) if active else ():
+            yp, yc, yn = (int(v[k]) for v in per_year[y]) if y in per_year else (0, 0, 0)
+            by_year[str(y)] = [yp, yc, yn]
+            if prev is not None:
+                growth[str(y)] = round((yc - prev) / max(prev, 1), 3)
+            prev = yc
+        out[g.member_ids[m]] = {
+            "papers": int(papers[k]),
+            "collaborators": int(len(idx)),
+            "coauthorships": int(w.sum()),
+            "internal": {g.member_ids[j]: int(x) for j, x in sorted(zip(idx[internal], w[internal]), key=lambda t: -t[1])},
+            "top_external": [[g.labels[ext_idx[o]], int(ext_w[o])] for o in order],
+            "by_year": by_year,
+            "growth": growth,
+        }
+    return out
+
+def build(corpus, profiles, top=TOP_EXTERNAL, path=OUT):
+    g = build_graph(corpus, AuthorIndex.from_profiles(profiles))
+    payload = {
+        "updated_at": int(time.time()),
+        "by_year_fields": ["papers", "collaborators", "new_collaborators"],
+        "papers": int(g.B.shape[0]),
+        "nodes": int(g.B.shape[1]),
+        "edges": int(g.A.nnz // 2),
+        "members": metrics(g, top),
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+    print(f"[ok] wrote {os.path.relpath(path, ROOT)} ({payload['nodes']} authors, {payload['edges']} co-author pairs)")
+    return payload
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Build the co-authorship graph and collaboration metrics.")
+    ap.add_argument("--top", type=int, default=TOP_EXTERNAL, help="external collaborators to keep per member")
+    args = ap.parse_args(argv)
+    from pipeline import load_corpus, manifest_ids, read_json, MEMBERS_DIR
+    profiles = [(mid, read_json(os.path.join(MEMBERS_DIR, mid, "profile.json")) or {}) for mid in manifest_ids()]
+    build(load_corpus(), profiles, top=args.top)
+
+if __name__ == "__main__":
+    main()
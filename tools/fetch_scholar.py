@@ -1,11 +1,20 @@
 import json, os, re, sys, time
 from urllib.parse import urlencode
-import requests
+import runlog
 
 ROOT = os.path.dirname(os.path.dirname(__file__))  # repo root
 MANIFEST = os.path.join(ROOT, "members", "manifest.json")
 API_KEY = os.environ.get("SERPAPI_KEY")
-BASE = "https://serpapi.com/search.json"
+BASE = os.environ.get("SERPAPI_BASE", "https://serpapi.com/search.json")
+
+_session = None
+
+def get_session():
+    global _session
+    if _session is None:
+        import requests
+        _session = runlog.instrument(requests.Session())
+    return _session
 
 def log(*a): print(*a, file=sys.stderr)
 
@@ -27,6 +36,7 @@ def get_scholar_user_from_profile(profile_path):
     j = read_json(profile_path) or {}
     return j.get("scholarUser")
 
+@runlog.span("serpapi.author")
 def fetch_scholar_author(user, limit=10):
     # SerpAPI docs: engine=google_scholar_author, author_id=user
     params = {
@@ -36,7 +46,7 @@ def fetch_scholar_author(user, limit=10):
         "hl": "en",
         "num": limit
     }
-    r = requests.get(BASE, params=params, timeout=30)
+    r = get_session().get(BASE, params=params, timeout=30)
     r.raise_for_status()
     return r.json()
 
@@ -94,4 +104,7 @@ def main():
             log(f"error for {mid}: {e}")
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        runlog.write_report("fetch_scholar")
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Perceptual-hash checks for highlight images.
+
+build_highlights.is_generic_image() only sees URLs, so a publisher banner
+served from an innocuous path gets through, and several papers from the
+same journal can end up with the same picture. This module looks at the
+pixels instead:
+
+  - candidates are downloaded once (at most MAX_BYTES each) and their
+    hashes cached by URL in data/image_hashes.json;
+  - every image gets a 64-bit dHash (gradient) and pHash (DCT) computed in
+    one NumPy batch;
+  - two images match when both hashes are within THRESHOLD bits;
+  - an image matching data/generic_images.json ("banned" entries are kept
+    by hand, "learned" ones by this module) is rejected as generic;
+  - an image used by LEARN_MIN_PAPERS or more papers in the batch is
+    generic as well, and is added to the learned set;
+  - otherwise, of the papers sharing an image, the first keeps it and the
+    others get "duplicate" (a preprint and its journal version can still
+    show their figure once).
+
+A learned false positive is undone by deleting its entry from "learned".
+
+Pillow decodes (imported on first use); hashing and the Hamming-distance
+matrices are pure NumPy.
+
+  checker = ImageChecker.load()
+  verdicts = checker.check([(paper_key, url), ...])   # ["ok" | "generic" | "duplicate" | "unknown", ...]
+  checker.save()
+"""
+
+import io, json, os
+
+import numpy as np
+
+import runlog
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+CACHE_PATH = os.path.join(ROOT, "data", "image_hashes.json")
+GENERIC_PATH = os.path.join(ROOT, "data", "generic_images.json")
+
+MAX_BYTES = 2 * 1024 * 1024
+TIMEOUT = 12
+THRESHOLD = 10          # bits out of 64
+LEARN_MIN_PAPERS = 3    # papers sharing an image before it is learned as generic
+PHASH_SIZE = 32
+
+# ---------- Hashing ----------
+def _dct_matrix(n):
+    k = np.arange(n)[:, None]
+    m = np.cos(np.pi * (2 * np.arange(n)[None, :] + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    m[0] /= np.sqrt(2.0)
+    return m
+
+_DCT = _dct_matrix(PHASH_SIZE)
+_BITS = 1 << np.arange(63, -1, -1, dtype=np.uint64)
+
+def _pack(bits):
+    """(N, 64) bool -> (N,) uint64."""
+    return (bits.astype(np.uint64) * _BITS).sum(axis=1, dtype=np.uint64)
+
+def decode(data):
+    """Image bytes -> ((32, 32), (8, 9)) grayscale float arrays, or None."""
+    from PIL import Image
+    try:
+        im = Image.open(io.BytesIO(data))
+        im.draft("L", (PHASH_SIZE * 2, PHASH_SIZE * 2))   # JPEG: decode at reduced scale
+        im = im.convert("L")
+        big = np.asarray(im.resize((PHASH_SIZE, PHASH_SIZE), Image.BILINEAR), dtype=np.float32)
+        small = np.asarray(im.resize((9, 8), Image.BILINEAR), dtype=np.float32)
+        return big, small
+    except Exception:
+        return None
+
+def hash_batch(bigs, smalls):
+    """Stacked (N, 32, 32) / (N, 8, 9) arrays -> (dhash, phash) uint64 arrays."""
+    d = _pack((smalls[:, :, 1:] > smalls[:, :, :-1]).reshape(len(smalls), 64))
+    coeffs = np.einsum("ij,njk,lk->nil", _DCT, bigs, _DCT, optimize=True)[:, :8, :8].reshape(len(bigs), 64)
+    med = np.median(coeffs[:, 1:], axis=1, keepdims=True)
+    return d, _pack(coeffs > med)
+
+def hamming(a, b):
+    """Pairwise bit distances between uint64 arrays a (N,) and b (M,) -> (N, M)."""
+    x = np.bitwise_xor(a[:, None], b[None, :])
+    return np.unpackbits(x.view(np.uint8).reshape(x.shape + (8,)), axis=-1).sum(axis=-1)
+
+# ---------- Downloads ----------
+def fetch(session, url):
+    """Body bytes, or None when unreachable, not an image or over MAX_BYTES."""
+    try:
+        with session.get(url, timeout=TIMEOUT, stream=True) as r:
+            if not r.ok or int(r.headers.get("Content-Length") or 0) > MAX_BYTES:
+                return None
+            if not (r.headers.get("Content-Type") or "image/").startswith("image/"):
+                return None
+            buf = bytearray()
+            for chunk in r.iter_content(64 * 1024):
+                buf += chunk
+                if len(buf) > MAX_BYTES:
+                    return None
+            return bytes(buf)
+    except Exception:
+        return None
+
+# ---------- Checker ----------
+def read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+def _hex(v): return f"{int(v):016x}"
+
+class ImageChecker:
+    def __init__(self, cache=None, banned=None, learned=None, session=None):
+        self.cache = cache or {}        # url -> [dhash hex, phash hex] or None (undecodable)
+        self.banned = banned or []      # [{"dhash", "phash", "source"}], curated by hand
+        self.learned = learned or []    # same shape, appended by check()
+        self.session = session
+
+    @classmethod
+    def load(cls, session=None):
+        gen = read_json(GENERIC_PATH) or {}
+        return cls(read_json(CACHE_PATH) or {}, gen.get("banned") or [], gen.get("learned") or [], session)
+
+    def save(self):
+        write_json(CACHE_PATH, self.cache)
+        write_json(GENERIC_PATH, {"threshold": THRESHOLD, "banned": self.banned, "learned": self.learned})
+
+    def hashes(self, urls):
+        """Fill the cache for uncached urls: download, decode, hash in one batch."""
+        todo = [u for u in dict.fromkeys(urls) if u not in self.cache]
+        if not todo:
+            return
+        decoded = []
+        with runlog.span("images.fetch"):
+            for u in todo:
+                data = fetch(self.session, u)
+                decoded.append(decode(data) if data else None)
+        ok = [i for i, d in enumerate(decoded) if d]
+        for u in todo:
+            self.cache[u] = None
+        if not ok:
+            return
+        with runlog.span("images.hash"):
+            d, p = hash_batch(np.stack([decoded[i][0] for i in ok]), np.stack([decoded[i][1] for i in ok]))
+        for j, i in enumerate(ok):
+            self.cache[todo[i]] = [_hex(d[j]), _hex(p[j])]
+        runlog.count("images.hashed", len(ok))
+
+    def check(self, candidates):
+        """candidates: [(paper_key, url)]. Returns one verdict per candidate, in order."""
+        self.hashes([u for _, u in candidates])
+        out = ["unknown"] * len(candidates)
+        known = [i for i, (_, u) in enumerate(candidates) if self.cache.get(u)]
+        if not known:
+            return out
+        d = np.array([int(self.cache[candidates[i][1]][0], 16) for i in known], dtype=np.uint64)
+        p = np.array([int(self.cache[candidates[i][1]][1], 16) for i in known], dtype=np.uint64)
+
+        generic = np.zeros(len(known), dtype=bool)
+        ref = self.banned + self.learned
+        if ref:
+            gd = np.array([int(g["dhash"], 16) for g in ref], dtype=np.uint64)
+            gp = np.array([int(g["phash"], 16) for g in ref], dtype=np.uint64)
+            generic = ((hamming(d, gd) <= THRESHOLD) & (hamming(p, gp) <= THRESHOLD)).any(axis=1)
+
+        # near[i, j]: candidates i and j show the same picture for different papers
+        keys = np.array([candidates[i][0] for i in known], dtype=object)
+        near = (hamming(d, d) <= THRESHOLD) & (hamming(p, p) <= THRESHOLD)
+        same_paper = keys[:, None] == keys[None, :]
+        papers = np.array([len(set(keys[row])) for row in near])
+        common = (papers >= LEARN_MIN_PAPERS) & ~generic
+        # One learned entry per cluster: skip images near an earlier learned one.
+        learn = common & ~np.tril(near & common[None, :], -1).any(axis=1)
+        for i in np.flatnonzero(learn):
+            self.learned.append({"dhash": _hex(d[i]), "phash": _hex(p[i]), "source": candidates[known[i]][1]})
+        runlog.count("images.learned", int(learn.sum()))
+        generic |= common
+
+        # Shared by fewer papers: the first candidate in the cluster keeps it.
+        dup = np.tril(near & ~same_paper, -1).any(axis=1) & ~generic
+        for j, i in enumerate(known):
+            out[i] = "generic" if generic[j] else "duplicate" if dup[j] else "ok"
+        return out
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Abstracts from the first page of open-access PDFs.
+
+Papers for which Semantic Scholar returns neither topics nor an abstract
+reach the classifier with only a title and venue. Most of them carry an
+`oa_pdf` link, and the abstract is on page one, which pdfTeX and most
+publishers write near the start of the file. So for each such paper this
+tool
+
+  - requests the PDF STEP_BYTES at a time (HTTP Range) and stops at the
+    first step that yields an abstract, or after RANGE_BYTES; from servers
+    that ignore Range the first RANGE_BYTES are read in one go and parsed
+    once;
+  - inflates the content streams in that prefix, pulls the text shown by
+    the Tj/TJ operators and keeps what follows "Abstract" up to the
+    introduction / keywords;
+  - caches the result in data/pdf_abstracts.json by URL and by a hash of
+    the downloaded bytes, so a URL is fetched once and mirrors of the same
+    file are parsed once.
+
+ai_classify_categories.py reads the cache for abstract-less papers; this
+tool is the only one that touches the network.
+
+Usage:
+  python tools/pdf_abstracts.py [--jobs 6] [--range-kb 128]   # max bytes read per PDF
+"""
+
+import argparse, hashlib, json, os, re, threading, zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import runlog
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+CACHE_PATH = os.path.join(ROOT, "data", "pdf_abstracts.json")
+
+RANGE_BYTES = 128 * 1024
+STEP_BYTES = 16 * 1024
+JOBS = 6
+TIMEOUT = 20
+MAX_CHARS = 2000
+MIN_WORDS = 25
+USER_AGENT = "pquip-site/1.0 (publication categorization)"
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            s = runlog.instrument(requests.Session())
+            s.headers.update({"User-Agent": USER_AGENT, "Accept": "application/pdf"})
+            _session = s
+    return _session
+
+def read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+# ---------- PDF text ----------
+STREAM_RE = re.compile(rb"stream\r?\n")
+# Streams that never hold page text: fonts, images, xref/object streams.
+SKIP_DICT_RE = re.compile(rb"/(?:Subtype\s*/Image|Length[123]\b|Type\s*/(?:XRef|ObjStm|XObject|Metadata|EmbeddedFile))")
+TOKEN_RE = re.compile(rb"\((?:\\.|[^\\()]|\((?:\\.|[^\\()])*\))*\)|<[0-9A-Fa-f\s]*>|\[|\]|-?\d*\.?\d+|/[^\s/\[\]()<>{}%]+|[A-Za-z'\"*]+", re.S)
+TEXT_BLOCK_RE = re.compile(rb"\bBT\b(.*?)\bET\b", re.S)
+ESCAPES = {b"\n": b"", b"\r": b"", b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"", b"f": b"", b"(": b"(", b")": b")", b"\\": b"\\"}
+ESCAPE_RE = re.compile(rb"\\([0-7]{1,3}|.)", re.S)
+# TeX OT1/T1 glyph slots for ligatures and dashes, WinAnsi dashes (fonts with their own
+# /Differences encodings are not decoded).
+GLYPHS = str.maketrans({"\x0b": "ff", "\x0c": "fi", "\x0d": "fl", "\x0e": "ffi", "\x0f": "ffl",
+                        "\x1b": "ff", "\x1c": "fi", "\x1d": "fl", "\x1e": "ffi", "\x1f": "ffl",
+                        "\x7b": "-", "\x7c": "-", "\x15": "-", "\x16": "-",
+                        "\x96": "–", "\x97": "—"})
+KERN_SPACE = -180       # TJ offsets (1/1000 em) wider than this are word gaps
+
+ABSTRACT_RE = re.compile(r"\babstract\b[\s.:\-–—]*", re.I)
+END_RE = re.compile(r"\b(?:(?:1|I)\.?\s*)?introduction\b|\bkey\s?words?\b|\bindex terms\b|\bPACS\b|©|\(c\) \d{4}|\bsubmitted\b|\breceived\b", re.I)
+
+def streams(data):
+    """Decoded bytes of every content-like stream in a (possibly truncated) PDF."""
+    for m in STREAM_RE.finditer(data):
+        head = data[max(0, m.start() - 400):m.start()]
+        head = head[head.rfind(b"<<"):] if b"<<" in head else head
+        if SKIP_DICT_RE.search(head):
+            continue
+        end = data.find(b"endstream", m.end())
+        body = data[m.end():end if end >= 0 else len(data)]
+        if b"/FlateDecode" in head:
+            try:
+                body = zlib.decompressobj().decompress(body)   # tolerates a cut-off tail
+            except zlib.error:
+                continue
+        elif b"/Filter" in head:
+            continue
+        yield body
+
+def unescape(lit):
+    def sub(m):
+        c = m.group(1)
+        return bytes([int(c, 8) & 0xFF]) if c[:1].isdigit() else ESCAPES.get(c, c)
+    return ESCAPE_RE.sub(sub, lit)
+
+def show(tok):
+    """Text of a string operand (literal or hex), or '' for CID-encoded runs."""
+    if tok[:1] == b"(":
+        raw = unescape(tok[1:-1])
+    else:
+        hexs = re.sub(rb"\s", b"", tok[1:-1])
+        raw = bytes.fromhex((hexs + b"0" * (len(hexs) % 2)).decode("ascii"))
+    if raw.count(0) * 3 > len(raw):      # two-byte glyph ids, no text without the CMap
+        return ""
+    return raw.decode("latin-1").translate(GLYPHS)
+
+def content_text(stream):
+    out = []
+    for block in TEXT_BLOCK_RE.finditer(stream):
+        operands, array = [], None
+        for tok in TOKEN_RE.findall(block.group(1)):
+            if tok == b"[":
+                array = []
+            elif tok == b"]":
+                operands.append(array or []); array = None
+            elif array is not None:
+                array.append(tok)
+            elif tok[:1] in b"(<" or tok[:1] in b"-.0123456789" or tok[:1] == b"/":
+                operands.append(tok)
+            else:
+                if tok in (b"Tj", b"'", b'"') and operands and isinstance(operands[-1], bytes):
+                    out.append(show(operands[-1]))
+                elif tok == b"TJ" and operands and isinstance(operands[-1], list):
+                    for el in operands[-1]:
+                        if el[:1] in b"(<":
+                            out.append(show(el))
+                        else:
+                            try:
+                                if float(el) < KERN_SPACE: out.append(" ")
+                            except ValueError:
+                                pass
+                elif tok in (b"Td", b"TD", b"T*", b"Tm"):
+                    out.append(" ")
+                operands = []
+        out.append(" ")
+    return "".join(out)
+
+def first_page_text(data):
+    return " ".join(t for t in (content_text(s) for s in streams(data)) if t.strip())
+
+def find_abstract(text):
+    text = re.sub(r"-\s+(?=[a-z])", "", text)        # hyphenated line breaks
+    text = re.sub(r"\s+", " ", text).strip()
+    m = ABSTRACT_RE.search(text)
+    if not m:
+        return None
+    body = text[m.end():]
+    end = END_RE.search(body, 200)
+    body = body[:end.start() if end else MAX_CHARS].strip()[:MAX_CHARS]
+    words = body.split()
+    letters = sum(c.isalpha() or c.isspace() for c in body)
+    if len(words) < MIN_WORDS or letters < 0.85 * len(body):
+        return None
+    return body
+
+# ---------- Fetch ----------
+def fetch_range(url, start, end, limit=None):
+    """
+    (bytes, done) for bytes [start, end) of url. A server that ignores Range
+    sends the file from the top; that is read up to `limit` (default `end`)
+    and marked done, as is a short read at the end of the file. bytes is
+    None on errors.
+    """
+    try:
+        with runlog.span("pdf.fetch"):
+            with get_session().get(url, headers={"Range": f"bytes={start}-{end - 1}"},
+                                   timeout=TIMEOUT, stream=True, allow_redirects=True) as r:
+                if r.status_code == 416:
+                    return b"", True
+                if not r.ok:
+                    return None, True
+                partial = r.status_code == 206
+                want = end - start if partial else (limit or end)
+                buf = bytearray()
+                for chunk in r.iter_content(32 * 1024):
+                    buf += chunk
+                    if len(buf) >= want:
+                        break
+                runlog.count("pdf.bytes", len(buf))
+                return bytes(buf[:want]), not partial or len(buf) < want
+    except Exception:
+        return None, True
+
+class Cache:
+    def __init__(self, urls=None, texts=None):
+        self.urls = urls or {}       # url -> sha (of the downloaded prefix) or "" when not a PDF
+        self.texts = texts or {}     # sha -> abstract or "" when none was found
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=CACHE_PATH):
+        d = read_json(path) or {}
+        return cls(d.get("urls"), d.get("abstracts"))
+
+    def save(self, path=CACHE_PATH):
+        write_json(path, {"range_bytes": RANGE_BYTES, "urls": self.urls, "abstracts": self.texts})
+
+    def get(self, url):
+        return self.texts.get(self.urls.get(url) or "") or None
+
+def wants_abstract(p):
+    return bool(p.get("oa_pdf")) and not p.get("topics") and not (p.get("abstract") or "").strip()
+
+def load_abstracts(path=CACHE_PATH):
+    """{oa_pdf url: abstract} for every cached PDF that yielded one."""
+    c = Cache.load(path)
+    return {u: c.texts[s] for u, s in c.urls.items() if c.texts.get(s)}
+
+def enrich_one(cache, url, nbytes):
+    """
+    Fetch STEP_BYTES at a time until an abstract turns up or `nbytes` have
+    been read (in one response when the server ignores Range). The first
+    step's hash identifies the file in the cache.
+    """
+    data, done, sha, text = b"", False, None, ""
+    while not done and len(data) < nbytes:
+        chunk, done = fetch_range(url, len(data), min(len(data) + STEP_BYTES, nbytes), limit=nbytes)
+        if chunk is None:
+            runlog.count("pdf.failed")
+            return                               # not cached; retried next run
+        data = chunk if not data or len(chunk) > STEP_BYTES else data + chunk
+        if not data.startswith(b"%PDF"):
+            runlog.count("pdf.not_pdf")
+            with cache.lock: cache.urls[url] = ""
+            return
+        if sha is None:
+            sha = hashlib.sha256(data[:STEP_BYTES]).hexdigest()[:16]
+            with cache.lock:
+                if sha in cache.texts:
+                    cache.urls[url] = sha
+                    return
+        with runlog.span("pdf.extract"):
+            text = find_abstract(first_page_text(data)) or ""
+        if text:
+            break
+    runlog.count("pdf.abstract" if text else "pdf.no_abstract")
+    with cache.lock:
+        cache.urls[url] = sha
+        cache.texts[sha] = text
+
+def enrich(pubs, jobs=JOBS, nbytes=RANGE_BYTES, path=CACHE_PATH):
+    """Fetch and extract abstracts for uncached abstract-less papers; returns the cache."""
+    cache = Cache.load(path)
+    urls = list(dict.fromkeys(p["oa_pdf"] for p in pubs if wants_abstract(p)))
+    todo = [u for u in urls if u not in cache.urls]
+    print(f"[pdf] {len(urls)} abstract-less papers with a PDF, {len(todo)} not cached")
+    if todo:
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as ex:
+            list(ex.map(lambda u: enrich_one(cache, u, nbytes), todo))
+    cache.save(path)
+    found = sum(1 for u in urls if cache.get(u))
+    print(f"[ok] wrote {os.path.relpath(path, ROOT)} ({found} of {len(urls)} with an abstract)")
+    return cache
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Extract abstracts from the first page of open-access PDFs.")
+    ap.add_argument("--jobs", type=int, default=JOBS, help="concurrent downloads")
+    ap.add_argument("--range-kb", type=int, default=RANGE_BYTES // 1024, help="bytes to fetch per PDF, in KiB")
+    args = ap.parse_args(argv)
+    from pipeline import load_corpus
+    enrich(load_corpus(), jobs=args.jobs, nbytes=args.range_kb * 1024)
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        runlog.write_report("pdf_abstracts")
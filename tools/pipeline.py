@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the publication pipeline.
+
+Stages form a DAG:
+
+  s2 ─┬─> dedupe ─┬─> classify ──> index
+      │           └─> highlights
+      └─> members (static member pages) ──> site (inline partials)
+  scholar (runs alongside s2; nothing downstream reads it)
+
+Every stage's inputs (files it reads, the tool scripts it runs and the
+outputs of the stages it depends on) are content-hashed. A stage whose
+input digest matches the one recorded in data/pipeline.state.json, and
+whose outputs are still on disk, is skipped. Fetch stages (s2, scholar)
+depend on remote data, so they always run unless --offline is given; when
+they produce the same content as last time, everything downstream is
+skipped. Volatile fields ("updated_at") are ignored when hashing.
+
+Independent ready stages run in parallel threads. The member corpus is
+loaded at most once per process and shared by the stages that need it.
+
+Usage:
+  python tools/pipeline.py                 # full run
+  python tools/pipeline.py --offline       # no network stages
+  python tools/pipeline.py --only classify # one stage (plus nothing else)
+  python tools/pipeline.py --force         # ignore recorded digests
+  python tools/pipeline.py --resume        # continue after a failed s2/highlights run
+"""
+
+import argparse, hashlib, json, os, sys, threading, time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from glob import glob
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+import runlog
+
+MEMBERS_DIR = os.path.join(ROOT, "members")
+DATA_DIR = os.path.join(ROOT, "data")
+MANIFEST = os.path.join(MEMBERS_DIR, "manifest.json")
+STATE_PATH = os.path.join(DATA_DIR, "pipeline.state.json")
+INDEX_PATH = os.path.join(DATA_DIR, "publications.index.json")
+
+VOLATILE_KEYS = ("updated_at",)
+
+def read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+# ---------- Hashing ----------
+def file_digest(path):
+    """sha256 of a file; JSON files are hashed without volatile top-level keys."""
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError:
+        return None
+    if path.endswith(".json"):
+        try:
+            obj = json.loads(raw)
+            if isinstance(obj, dict):
+                for k in VOLATILE_KEYS: obj.pop(k, None)
+            raw = json.dumps(obj, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        except ValueError:
+            pass
+    return hashlib.sha256(raw).hexdigest()
+
+def digest_of(paths, extra=()):
+    h = hashlib.sha256()
+    for p in sorted(set(paths)):
+        h.update(os.path.relpath(p, ROOT).encode("utf-8"))
+        h.update(b"\0")
+        h.update((file_digest(p) or "-").encode("ascii"))
+        h.update(b"\n")
+    for e in extra:
+        h.update(str(e).encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+def tool(name):
+    return os.path.join(HERE, name)
+
+def member_files(name):
+    return glob(os.path.join(MEMBERS_DIR, "*", name))
+
+def manifest_ids():
+    ids = read_json(MANIFEST)
+    return ids if isinstance(ids, list) else []
+
+# ---------- Shared context ----------
+class Context:
+    """Carries options and the lazily-loaded corpus between stages."""
+
+    def __init__(self, offline=False, resume=False):
+        self.offline = offline
+        self.resume = resume
+        self._corpus = None
+        self._lock = threading.Lock()
+
+    @property
+    def corpus(self):
+        """Deduplicated publications (a publication.Corpus), each tagged with `key` and `members`."""
+        with self._lock:
+            if self._corpus is None:
+                self._corpus = load_corpus()
+            return self._corpus
+
+    def invalidate(self):
+        with self._lock:
+            self._corpus = None
+
+def load_corpus():
+    import ai_classify_categories as ai
+    from publication import Corpus, Publication
+    with runlog.span("corpus.load"):
+        merged = {}
+        for mid in manifest_ids():
+            data = read_json(os.path.join(MEMBERS_DIR, mid, "publications.json"))
+            for p in ai.iter_publications(data):
+                key = ai.paper_key(p)
+                if key not in merged:
+                    merged[key] = Publication(**p, key=key, members=[mid])
+                elif mid not in merged[key].members:
+                    merged[key].members.append(mid)
+        runlog.count("corpus.papers", len(merged))
+        return Corpus(merged.values())
+
+# ---------- Stages ----------
+class Stage:
+    def __init__(self, name, run, deps=(), inputs=lambda: [], outputs=lambda: [],
+                 code=(), volatile=False, needs_network=False):
+        self.name = name
+        self.run = run
+        self.deps = tuple(deps)
+        self.inputs = inputs
+        self.outputs = outputs
+        self.code = tuple(code)
+        self.volatile = volatile
+        self.needs_network = needs_network
+
+def run_s2(ctx):
+    import s2_to_member_json
+    s2_to_member_json.main(["--resume"] if ctx.resume else [])
+    ctx.invalidate()
+
+def run_scholar(ctx):
+    import fetch_scholar
+    if not fetch_scholar.API_KEY:
+        print("[pipeline] scholar: SERPAPI_KEY not set; nothing fetched", file=sys.stderr)
+        return
+    fetch_scholar.main()
+
+def run_dedupe(ctx):
+    print(f"[pipeline] dedupe: {len(ctx.corpus)} unique publications")
+
+def run_abstracts(ctx):
+    import pdf_abstracts
+    pdf_abstracts.enrich(ctx.corpus)
+
+def run_classify(ctx):
+    import ai_classify_categories
+    ai_classify_categories.classify(ctx.corpus)
+
+def run_highlights(ctx):
+    import build_highlights
+    build_highlights.build(ctx.corpus, resume=ctx.resume)
+
+def run_members(ctx):
+    import render_members
+    render_members.main([])
+
+def run_site(ctx):
+    import assemble_site
+    assemble_site.main([])
+
+def run_index(ctx):
+    from attribution import AuthorIndex
+    cats = read_json(os.path.join(DATA_DIR, "publication_categories.json")) or {}
+    with runlog.span("attribution"):
+        authors = AuthorIndex.from_profiles(
+            (mid, read_json(os.path.join(MEMBERS_DIR, mid, "profile.json")) or {}) for mid in manifest_ids())
+    items = []
+    for p in ctx.corpus:
+        # Name matches in author order, then any member whose S2 feed
+        # listed the paper but whose name did not match.
+        members = authors.resolve(p.get("authors"))
+        members += [m for m in p["members"] if m not in members]
+        items.append({
+            "key": p["key"],
+            "title": p.get("title") or "",
+            "year": p.get("year"),
+            "venue": p.get("venue") or "",
+            "doi": p.get("doi"),
+            "url": p.get("url") or "",
+            "authors": p.get("authors") or [],
+            "members": members,
+            "categories": cats.get(p["key"], []),
+        })
+    items.sort(key=lambda x: (-(x.get("year") or 0), x.get("title") or ""))
+    write_json(INDEX_PATH, {"updated_at": int(time.time()), "publications": items})
+    print(f"[pipeline] wrote {os.path.relpath(INDEX_PATH, ROOT)} ({len(items)} items)")
+
+def run_collab(ctx):
+    import coauthors
+    with runlog.span("collab"):
+        coauthors.build(ctx.corpus, (
+            (mid, read_json(os.path.join(MEMBERS_DIR, mid, "profile.json")) or {}) for mid in manifest_ids()))
+
+def run_related(ctx):
+    import related
+    with runlog.span("related"):
+        related.build(ctx.corpus)
+
+def profiles():
+    return [MANIFEST] + member_files("profile.json")
+
+STAGES = [
+    Stage("s2", run_s2, inputs=profiles, outputs=lambda: member_files("publications.json"),
+          code=[tool("s2_to_member_json.py")], volatile=True, needs_network=True),
+    Stage("scholar", run_scholar, inputs=profiles, outputs=lambda: member_files("scholar.json"),
+          code=[tool("fetch_scholar.py")], volatile=True, needs_network=True),
+    Stage("dedupe", run_dedupe, deps=["s2"],
+          inputs=lambda: [MANIFEST] + member_files("publications.json")),
+    Stage("abstracts", run_abstracts, deps=["dedupe"],
+          outputs=lambda: [os.path.join(DATA_DIR, "pdf_abstracts.json")],
+          code=[tool("pdf_abstracts.py")], needs_network=True),
+    Stage("classify", run_classify, deps=["dedupe", "abstracts"],
+          inputs=lambda: glob(os.path.join(DATA_DIR, "categories.*.json")),
+          outputs=lambda: [os.path.join(DATA_DIR, "publication_categories.json"),
+                           os.path.join(DATA_DIR, "publication_categories_verbose.json")],
+          code=[tool("ai_classify_categories.py")]),
+    Stage("highlights", run_highlights, deps=["dedupe"],
+          outputs=lambda: [os.path.join(DATA_DIR, "highlights.auto.json"),
+                           os.path.join(DATA_DIR, "image_hashes.json"),
+                           os.path.join(DATA_DIR, "generic_images.json")],
+          code=[tool("build_highlights.py"), tool("image_dedupe.py")], needs_network=True),
+    Stage("members", run_members, deps=["s2"],
+          inputs=lambda: [MANIFEST] + member_files("profile.json") + member_files("page.html")
+                         + member_files("publications.json") + member_files("*.pdf"),
+          outputs=lambda: member_files("index.html"),
+          code=[tool("render_members.py")]),
+    # Pages are both input and output here; assemble_site does its own
+    # per-page digest check, so the stage just always runs.
+    Stage("site", run_site, deps=["members"], volatile=True,
+          outputs=lambda: glob(os.path.join(ROOT, "*.html")) + member_files("index.html")),
+    Stage("index", run_index, deps=["dedupe", "classify"], inputs=profiles, outputs=lambda: [INDEX_PATH],
+          code=[tool("attribution.py")]),
+    Stage("related", run_related, deps=["dedupe", "abstracts"],
+          outputs=lambda: [os.path.join(DATA_DIR, "publications.related.json")],
+          code=[tool("related.py")]),
+    Stage("collab", run_collab, deps=["dedupe"], inputs=profiles,
+          outputs=lambda: [os.path.join(DATA_DIR, "collaboration.json")],
+          code=[tool("coauthors.py"), tool("attribution.py")]),
+]
+
+# ---------- Runner ----------
+class Runner:
+    def __init__(self, stages, ctx, force=False, only=None, jobs=4):
+        self.stages = {s.name: s for s in stages}
+        self.ctx = ctx
+        self.force = force
+        self.only = set(only or [])
+        self.jobs = jobs
+        self.state = read_json(STATE_PATH) or {}
+        self.saved = json.dumps(self.state, sort_keys=True)
+        self.status = {}
+        self.out_digest = {}
+
+    def input_digest(self, s):
+        extra = [s.name] + [f"{d}={self.out_digest.get(d)}" for d in s.deps]
+        if s.name == "highlights":
+            extra.append(time.strftime("%Y"))  # highlights are per calendar year
+        return digest_of(list(s.inputs()) + list(s.code), extra)
+
+    def should_skip(self, s, digest):
+        if self.only and s.name not in self.only:
+            return "not selected"
+        if s.needs_network and self.ctx.offline:
+            return "offline"
+        if self.force or s.volatile:
+            return None
+        prev = self.state.get(s.name) or {}
+        outs = list(s.outputs())
+        if prev.get("inputs") == digest and all(os.path.exists(o) for o in outs):
+            return "unchanged"
+        return None
+
+    def execute(self, s):
+        digest = self.input_digest(s)
+        why = self.should_skip(s, digest)
+        if why:
+            prev = self.state.get(s.name) or {}
+            # A stage that did not run passes on what it produced last time.
+            outs = list(s.outputs())
+            self.out_digest[s.name] = prev.get("outputs") or (digest_of(outs) if outs else digest)
+            return "skipped", why, 0.0
+        t0 = time.perf_counter()
+        with runlog.span(f"stage.{s.name}"):
+            s.run(self.ctx)
+        outs = list(s.outputs())
+        self.out_digest[s.name] = digest_of(outs) if outs else digest
+        # Digests only: CI commits this file, so nothing run-specific goes in.
+        self.state[s.name] = {"inputs": digest, "outputs": self.out_digest[s.name]}
+        return "ran", "", time.perf_counter() - t0
+
+    def run(self):
+        pending = dict(self.stages)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            while pending or running:
+                for name, s in list(pending.items()):
+                    if any(d in pending or d in running.values() for d in s.deps):
+                        continue
+                    del pending[name]
+                    failed = [d for d in s.deps if self.status[d][0] in ("failed", "blocked")]
+                    if failed:
+                        self.status[name] = ("blocked", f"after {', '.join(failed)}", 0.0)
+                        continue
+                    # A dependency that ran but produced identical output does
+                    # not force a re-run: the input digest covers its outputs.
+                    running[pool.submit(self.execute, s)] = name
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = running.pop(fut)
+                    try:
+                        self.status[name] = fut.result()
+                    except BaseException as e:
+                        self.status[name] = ("failed", f"{type(e).__name__}: {e}", 0.0)
+        if json.dumps(self.state, sort_keys=True) != self.saved:
+            write_json(STATE_PATH, dict(sorted(self.state.items())))
+        return self.status
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Run the publication pipeline as a dependency-aware DAG.")
+    ap.add_argument("--offline", action="store_true", help="skip stages that need the network")
+    ap.add_argument("--force", action="store_true", help="re-run stages even if their inputs are unchanged")
+    ap.add_argument("--only", nargs="+", choices=[s.name for s in STAGES], help="run only these stages")
+    ap.add_argument("--jobs", type=int, default=4, help="max stages in flight")
+    ap.add_argument("--resume", action="store_true",
+                    help="let s2/highlights continue from the checkpoint journal of a failed run")
+    args = ap.parse_args(argv)
+
+    runner = Runner(STAGES, Context(offline=args.offline, resume=args.resume), force=args.force, only=args.only, jobs=args.jobs)
+    try:
+        status = runner.run()
+    finally:
+        runlog.write_report("pipeline")
+    for s in STAGES:
+        state, why, dt = status.get(s.name, ("?", "", 0.0))
+        print(f"  {s.name:<11} {state:<8} {f'{dt:.2f}s' if state == 'ran' else why}")
+    if any(v[0] == "failed" for v in status.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory publication records.
+
+members/*/publications.json rows are dicts with the same dozen keys
+repeated per paper, and every occurrence of an author name or venue is its
+own string. Publication stores a row in __slots__ instead, with author,
+venue, topic and field-of-study strings interned (one copy per distinct
+name across the corpus) and list fields kept as tuples. Corpus keeps the
+records plus a `years` column (array "H", 0 = unknown) that coauthors.py
+takes as one NumPy array instead of parsing each record's year.
+
+Records answer p.get("title") / p["key"] like the dicts they replace, so
+paper_key() and the other helpers take either.
+
+  corpus = Corpus.from_dicts(json_rows)
+  this_year = corpus.with_year(2025)
+  years = np.asarray(corpus.years)
+  rows = [p.to_dict() for p in corpus]      # on-disk shape again
+"""
+
+import sys
+from array import array
+
+# normalize() output order; BASE keys are always written, OPTIONAL ones
+# only when set.
+BASE = ("paperId", "title", "year", "venue", "doi", "url", "authors", "oa_pdf", "arxivId")
+OPTIONAL = ("fieldsOfStudy", "topics", "abstract")
+FIELDS = BASE + OPTIONAL
+# In-memory only (set by pipeline.load_corpus), never written to disk.
+LOCAL = ("key", "members")
+INTERNED_LISTS = ("authors", "fieldsOfStudy", "topics")
+
+_intern = sys.intern
+
+def _names(values):
+    return tuple(_intern(str(v)) for v in values if v) if values else None
+
+class Publication:
+    __slots__ = FIELDS + LOCAL + ("extra",)
+
+    def __init__(self, **kw):
+        for f in self.__slots__:
+            setattr(self, f, None)
+        for k, v in kw.items():
+            self.set(k, v)
+
+    def set(self, name, value):
+        if name in INTERNED_LISTS:
+            value = _names(value)
+        elif name == "venue":
+            value = _intern(value) if value else value
+        if name in self.__slots__ and name != "extra":
+            setattr(self, name, value)
+        else:
+            if self.extra is None: self.extra = {}
+            self.extra[name] = value
+
+    @classmethod
+    def from_dict(cls, d):
+        if isinstance(d, cls):
+            return d
+        return cls(**d)
+
+    def to_dict(self):
+        out = {f: list(v) if isinstance(v, tuple) else v for f in BASE for v in (getattr(self, f),)}
+        if out["authors"] is None: out["authors"] = []
+        for f in OPTIONAL:
+            v = getattr(self, f)
+            if v: out[f] = list(v) if isinstance(v, tuple) else v
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+    def replace(self, **kw):
+        p = Publication.__new__(Publication)
+        for f in self.__slots__:
+            setattr(p, f, getattr(self, f))
+        if self.extra is not None: p.extra = dict(self.extra)
+        for k, v in kw.items():
+            p.set(k, v)
+        return p
+
+    # dict-style reads, so code written against JSON rows keeps working
+    def get(self, name, default=None):
+        if name in self.__slots__ and name != "extra":
+            v = getattr(self, name)
+        else:
+            v = (self.extra or {}).get(name)
+        return default if v is None else v
+
+    __setitem__ = set
+
+    def __getitem__(self, name):
+        v = self.get(name)
+        if v is None:
+            raise KeyError(name)
+        return v
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def __repr__(self):
+        return f"Publication({self.paperId or self.doi or self.title!r})"
+
+class Corpus:
+    """Publication records plus their `years` column, in record order."""
+
+    __slots__ = ("records", "years")
+
+    def __init__(self, records=()):
+        self.records = []
+        self.years = array("H")
+        for p in records:
+            self.append(p)
+
+    @classmethod
+    def from_dicts(cls, rows):
+        return cls(Publication.from_dict(r) for r in rows if isinstance(r, (dict, Publication)))
+
+    def append(self, p):
+        self.records.append(p)
+        y = str(p.year or 0)
+        self.years.append(int(y) if y.isdigit() and int(y) < 65536 else 0)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __getitem__(self, i):
+        return self.records[i]
+
+    def with_year(self, year):
+        return [p for p, y in zip(self.records, self.years) if y == year]
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Related publications, precomputed at build time.
+
+Every deduplicated publication becomes a sparse TF-IDF vector over its
+title, venue and abstract (S2's, or the first-page one from
+pdf_abstracts.py). Vectors are L2-normalized, so X @ X.T is cosine
+similarity; it is computed BLOCK rows at a time and only each row's top-k
+survive, so memory grows with BLOCK * n and the nonzeros of a block, never
+n * n.
+
+Writes data/publications.related.json, keyed by the paper_key() ids used
+in publication_categories.json:
+
+  {"k": 5, "related": {"S2:abc": [["S2:def", 0.41], ...], ...}}
+
+Usage:
+  python tools/related.py [--k 5] [--min-score 0.1]
+"""
+
+import argparse, json, os, re, sys, time
+
+import numpy as np
+import scipy.sparse as sp
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+from attribution import fold
+
+OUT = os.path.join(ROOT, "data", "publications.related.json")
+TOP_K = 5
+MIN_SCORE = 0.1
+BLOCK = 512
+MIN_DF = 2          # terms seen in one paper only cannot relate two papers
+
+WORD_RE = re.compile(r"[a-z][a-z0-9]+")
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or that the their this to was
+were which with we our via using based new study studies towards toward paper results show
+""".split())
+
+def tokens(text):
+    words = [w for w in WORD_RE.findall(" ".join(fold(text))) if w not in STOPWORDS]
+    # unigrams + adjacent bigrams ("quantum memory" is more telling than either word)
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+def doc_text(p, pdf_text=None):
+    abstract = (p.get("abstract") or "").strip()
+    if not abstract and pdf_text and p.get("oa_pdf"):
+        abstract = pdf_text.get(p["oa_pdf"]) or ""
+    # Title twice: it is short, and what the paper is about
+    return " ".join([p.get("title") or "", p.get("title") or "", p.get("venue") or "", abstract])
+
+def tfidf(docs):
+    """docs: lists of tokens -> L2-normalized CSR (n_docs x n_terms)."""
+    vocab, rows, cols, vals = {}, [], [], []
+    for i, toks in enumerate(docs):
+        counts = {}
+        for t in toks:
+            j = vocab.get(t)
+            if j is None:
+                j = vocab[t] = len(vocab)
+            counts[j] = counts.get(j, 0) + 1
+        rows.extend([i] * len(counts)); cols.extend(counts); vals.extend(counts.values())
+    X = sp.csr_matrix((np.array(vals, dtype=np.float32), (np.array(rows, dtype=np.int32), np.array(cols, dtype=np.int32))),
+                      shape=(len(docs), len(vocab)))
+    X.data = 1.0 + np.log(X.data)                                  # sublinear tf
+    df = np.bincount(X.indices, minlength=X.shape[1])
+    idf = np.log((1.0 + X.shape[0]) / (1.0 + df)).astype(np.float32) + 1.0
+    idf[df < MIN_DF] = 0.0
+    X = X @ sp.diags(idf)
+    X.eliminate_zeros()
+    norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return (sp.diags(1.0 / norms) @ X).tocsr().astype(np.float32)
+
+def top_k(X, k=TOP_K, min_score=MIN_SCORE, block=BLOCK):
+    """Yield (row, [(col, score), ...]) for the k most similar other rows."""
+    XT = X.T.tocsr()
+    for start in range(0, X.shape[0], block):
+        S = (X[start:start + block] @ XT).tocsr()
+        for r in range(S.shape[0]):
+            i = start + r
+            lo, hi = S.indptr[r], S.indptr[r + 1]
+            idx, score = S.indices[lo:hi], S.data[lo:hi]
+            keep = (idx != i) & (score >= min_score)
+            idx, score = idx[keep], score[keep]
+            if len(idx) > k:
+                part = np.argpartition(-score, k)[:k]
+                idx, score = idx[part], score[part]
+            order = np.lexsort((idx, -score))
+            yield i, [(int(idx[o]), float(score[o])) for o in order]
+
+def build(corpus, k=TOP_K, min_score=MIN_SCORE, path=OUT):
+    import ai_classify_categories as ai
+    from pdf_abstracts import load_abstracts
+    pdf_text = load_abstracts()
+    pubs = {}
+    for p in corpus:
+        pubs.setdefault(p.get("key") or ai.paper_key(p), p)
+    keys = sorted(pubs)
+    X = tfidf([tokens(doc_text(pubs[key], pdf_text)) for key in keys])
+    related = {}
+    for i, hits in top_k(X, k, min_score):
+        if hits:
+            related[keys[i]] = [[keys[j], round(s, 3)] for j, s in hits]
+    payload = {"updated_at": int(time.time()), "k": k, "related": related}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+    print(f"[ok] wrote {os.path.relpath(path, ROOT)} ({len(related)} of {len(keys)} papers, {X.shape[1]} terms)")
+    return payload
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Precompute related publications (TF-IDF, cosine top-k).")
+    ap.add_argument("--k", type=int, default=TOP_K, help="related papers per publication")
+    ap.add_argument("--min-score", type=float, default=MIN_SCORE, help="minimum cosine similarity")
+    args = ap.parse_args(argv)
+    from pipeline import load_corpus
+    build(load_corpus(), k=args.k, min_score=args.min_score)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Prerender member pages to static HTML.
+
+For every id in members/manifest.json this reads
+
+  members/<id>/profile.json, page.html, publications.json and the CV file
+  (cv.pdf, resume.pdf, <id>-cv.pdf or <id>-resume.pdf, first match)
+
+and writes members/<id>/index.html with the same markup assets/js/member.js
+builds at runtime, so a member page is one request instead of a fetch
+waterfall plus CV HEAD probes. A digest of the inputs is stored in the page;
+members whose inputs did not change are not rewritten.
+
+Usage:
+  python tools/render_members.py            # changed members only
+  python tools/render_members.py --force    # everything
+  python tools/render_members.py utkarsh    # just these ids
+"""
+
+import argparse, hashlib, json, os, re, sys
+from html import escape
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+MEMBERS_DIR = os.path.join(ROOT, "members")
+MANIFEST = os.path.join(MEMBERS_DIR, "manifest.json")
+
+OUT_NAME = "index.html"
+RECENT_PUBS = 6
+PLACEHOLDER_PHOTO = "assets/img/person-placeholder.svg"
+CV_NAMES = ("cv.pdf", "resume.pdf", "{id}-cv.pdf", "{id}-resume.pdf")
+VOLATILE_KEYS = ("updated_at",)   # not shown on the page; ignored by the digest
+DIGEST_RE = re.compile(r'<meta name="render-inputs" content="([0-9a-f]+)"')
+
+# Same icons as assets/js/member.js
+ICONS = {
+    "linkedin": '<svg viewBox="0 0 24 24" fill="currentColor"><path d="M4.98 3.5a2.5 2.5 0 11-.02 5.001 2.5 2.5 0 01.02-5zM3 8.98h3.96V21H3zM9.5 8.98H13v1.64h.05c.49-.93 1.69-1.9 3.48-1.9 3.72 0 4.41 2.45 4.41 5.64V21H17V14.8c0-1.47-.03-3.36-2.05-3.36-2.05 0-2.37 1.6-2.37 3.25V21H9.5z"/></svg>',
+    "scholar": '<svg viewBox="0 0 24 24" fill="currentColor"><path d="M12 2 3 7l9 5 9-5-9-5zm0 7.5L6 6.17v3.66L12 13l6-3.17V6.17L12 9.5zM6 12.5V18l6 3 6-3v-5.5l-6 3-6-3z"/></svg>',
+    "github": '<svg viewBox="0 0 24 24" fill="currentColor"><path d="M12 .5A11.5 11.5 0 000 12a11.5 11.5 0 008 11c.6.1.8-.3.8-.6v-2.1c-3.3.7-4-1.6-4-1.6-.5-1.3-1.7-1.7-1.7-1.7-1-.7.1-.7.1-.7 1.2.1 1.8 1.3 1.8 1.3 1 .1.8-.8 1.9-1.3-2.7-.3-5.5-1.4-5.5-6A4.7 4.7 0 014 7.1c-.1-.3-.5-1.6.1-3.3 0 0 1-.3 3.3 1.3A11.2 11.2 0 0112 4.7c1.1 0 2.2.2 3.2.5 2.3-1.6 3.3-1.3 3.3-1.3.6 1.7.2 3 .1 3.3.8.9 1.2 2 1.2 3.2 0 4.6-2.8 5.7-5.5 6 .9.7 1.9 2.2 1.9 4.4V22c0 .3.2.7.8.6A11.5 11.5 0 0024 12 11.5 11.5 0 0012 .5z"/></svg>',
+    "orcid": '<svg viewBox="0 0 256 256"><circle cx="128" cy="128" r="120" fill="#A6CE39"/><path fill="#fff" d="M86 88h20v80H86zM96 64a12 12 0 110 24 12 12 0 010-24zm42 24c35 0 54 24 54 60 0 38-21 60-56 60h-26V88h28zm-8 104h6c24 0 36-16 36-44s-12-44-36-44h-6v88z"/></svg>',
+    "globe": '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor"><circle cx="12" cy="12" r="9"></circle><path d="M3 12h18M12 3a15 15 0 010 18M12 3a15 15 0 000 18"></path></svg>',
+}
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <base href="../../" />
+  <title>{title} — PQUIP Group</title>
+  <meta name="render-inputs" content="{digest}" />
+  <!-- Generated by tools/render_members.py from members/{id}/; edit those files, not this one. -->
+  <!-- Global head is injected via partials/head.html -->
+  <link rel="stylesheet" href="assets/css/member.css" />
+  <link rel="stylesheet" href="assets/css/slider.css" />
+</head>
+<body>
+  <div id="site-header"></div>
+
+  <main class="container main-content">
+    <article id="member-article" class="profile">{article}</article>
+  </main>
+
+  <div id="site-footer"></div>
+
+  <!-- Partials (head/header/footer) -->
+  <script src="assets/js/main.js"></script>
+</body>
+</html>
+"""
+
+def read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+def read_text(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return ""
+
+# ---------- Inputs ----------
+def find_cv(mid):
+    for name in CV_NAMES:
+        rel = f"members/{mid}/{name.format(id=mid)}"
+        if os.path.isfile(os.path.join(ROOT, rel)):
+            return rel
+    return None
+
+def input_paths(mid):
+    base = os.path.join(MEMBERS_DIR, mid)
+    paths = [os.path.join(base, n) for n in ("profile.json", "page.html", "publications.json")]
+    cv = find_cv(mid)
+    if cv: paths.append(os.path.join(ROOT, cv))
+    return paths
+
+def file_bytes(path):
+    """File contents; JSON objects without their volatile top-level keys (as pipeline.file_digest)."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if path.endswith(".json"):
+        try:
+            obj = json.loads(raw)
+            if isinstance(obj, dict):
+                for k in VOLATILE_KEYS: obj.pop(k, None)
+            raw = json.dumps(obj, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        except ValueError:
+            pass
+    return raw
+
+def inputs_digest(mid):
+    h = hashlib.sha256()
+    with open(__file__, "rb") as f:
+        h.update(f.read())
+    for p in input_paths(mid):
+        h.update(os.path.relpath(p, ROOT).encode("utf-8") + b"\0")
+        try:
+            h.update(hashlib.sha256(file_bytes(p)).digest())
+        except OSError:
+            h.update(b"-")
+    return h.hexdigest()
+
+def parse_member_sections(html):
+    """#about innerHTML plus #ri-list / #patents-list item innerHTML (as member.js does)."""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html or "", "html.parser")
+    inner = lambda el: "".join(str(c) for c in el.contents)
+    about = soup.select_one("#about")
+    return {
+        "about": inner(about) if about else "",
+        "interests": [inner(li) for li in soup.select("#ri-list li")],
+        "patents": [inner(li) for li in soup.select("#patents-list li")],
+    }
+
+def load_pubs(mid):
+    j = read_json(os.path.join(MEMBERS_DIR, mid, "publications.json"))
+    if isinstance(j, list): return j
+    if isinstance(j, dict) and isinstance(j.get("publications"), list): return j["publications"]
+    return []
+
+# ---------- Rendering ----------
+def icon_btn(href, svg, label):
+    if not href: return ""
+    return (f'<a class="icon-btn" href="{escape(href)}" target="_blank" rel="noopener" '
+            f'aria-label="{label}" title="{label}">{svg}</a>')
+
+def render_pubs(pubs):
+    pubs = [x for x in pubs if isinstance(x, dict) and x.get("title")]
+    pubs.sort(key=lambda x: x.get("year") or 0, reverse=True)
+    pubs = pubs[:RECENT_PUBS]
+    if not pubs:
+        body = '<p class="muted">No publications found.</p>'
+    else:
+        items = []
+        for p in pubs:
+            year = f' ({p["year"]})' if p.get("year") else ""
+            venue = f' — <em>{escape(p["venue"])}</em>' if p.get("venue") else ""
+            href = f'https://doi.org/{p["doi"]}' if p.get("doi") else p.get("url")
+            # No "#" fallback: with <base href="../../"> it would lead to the site root.
+            title = (f'<a href="{escape(href)}" target="_blank" rel="noopener">{escape(p["title"])}</a>'
+                     if href else escape(p["title"]))
+            items.append(f'<li><div class="pub-title">{title}{year}{venue}</div></li>')
+        body = '<ul class="pubs">' + "".join(items) + "</ul>"
+    return f"""
+    <section class="card section">
+      <h3 class="section__title">Recent Publications</h3>
+      {body}
+    </section>"""
+
+def render_interests(items):
+    if not items: return ""
+    cards = []
+    for item in items:
+        t, _, rest = item.partition("—")
+        desc = rest.strip()
+        cards.append(f'<div class="ri-card"><h4>{t.strip()}</h4>{f"<p>{desc}</p>" if desc else ""}</div>')
+    return f"""
+    <section class="card section">
+      <h3 class="section__title">Research Interests</h3>
+      <div class="ri-grid">
+        {"".join(cards)}
+      </div>
+    </section>"""
+
+def render_patents(items):
+    if not items: return ""
+    return f"""
+    <section class="card section">
+      <h3 class="section__title">Patents</h3>
+      <ul class="patents">{"".join(f"<li>{x}</li>" for x in items)}</ul>
+    </section>"""
+
+def render_member(mid):
+    p = read_json(os.path.join(MEMBERS_DIR, mid, "profile.json")) or {}
+    name = p.get("name")
+    name = str(name[0]) if isinstance(name, list) and name else str(name or mid)
+    role = p.get("role") or ""
+    email = p.get("email") or ""
+    phone = p.get("phone") or ""
+    photo = p.get("photo") or PLACEHOLDER_PHOTO
+    orcid = f'https://orcid.org/{p["orcid"]}' if p.get("orcid") else ""
+
+    parsed = parse_member_sections(read_text(os.path.join(MEMBERS_DIR, mid, "page.html")))
+
+    icons = "".join([
+        icon_btn(p.get("linkedin"), ICONS["linkedin"], "LinkedIn"),
+        icon_btn(p.get("scholar"), ICONS["scholar"], "Google Scholar"),
+        icon_btn(p.get("github"), ICONS["github"], "GitHub"),
+        icon_btn(orcid, ICONS["orcid"], "ORCID"),
+        icon_btn(p.get("website"), ICONS["globe"], "Website"),
+    ])
+    cv = find_cv(mid)
+    cv_btn = f'<a class="btn btn-ghost" href="{cv}" target="_blank" rel="noopener">Download CV</a>' if cv else ""
+
+    contact = ""
+    if email:
+        contact += f'<a class="contact-link" href="mailto:{escape(email)}">{escape(email)}</a>'
+    if phone:
+        tel = re.sub(r"[^+0-9]", "", phone)
+        contact += f'<span class="dot">•</span><a class="contact-link" href="tel:{tel}">{escape(phone)}</a>'
+
+    about = f'<section class="card section about">{parsed["about"]}</section>' if parsed["about"] else ""
+    article = f"""
+    <header class="profile-hero">
+      <div class="hero-inner">
+        <img class="avatar" src="{escape(photo)}" alt="{escape(name)}" />
+        <div class="meta">
+          <h1 class="title">{escape(name)}</h1>
+          <p class="subtitle">{escape(role)}</p>
+          <div class="contact">
+            {contact}
+          </div>
+          <div class="actions">
+            {cv_btn}
+            <div class="icon-bar">{icons}</div>
+          </div>
+        </div>
+      </div>
+    </header>
+
+    <div class="profile-sections">
+      {about}
+      {render_interests(parsed["interests"])}
+      {render_pubs(load_pubs(mid))}
+      {render_patents(parsed["patents"])}
+    </div>
+  """
+    return name, article
+
+def render(mid, force=False):
+    """Render one member; returns True if the page was (re)written."""
+    out = os.path.join(MEMBERS_DIR, mid, OUT_NAME)
+    digest = inputs_digest(mid)
+    if not force:
+        m = DIGEST_RE.search(read_text(out))
+        if m and m.group(1) == digest:
+            return False
+    name, article = render_member(mid)
+    html = PAGE.format(title=escape(name), digest=digest, id=mid, article=article)
+    tmp = out + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(html)
+    os.replace(tmp, out)
+    return True
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Prerender members/<id>/index.html.")
+    ap.add_argument("ids", nargs="*", help="member ids (default: members/manifest.json)")
+    ap.add_argument("--force", action="store_true", help="rewrite even if inputs are unchanged")
+    args = ap.parse_args(argv)
+
+    ids = args.ids or read_json(MANIFEST)
+    if not isinstance(ids, list):
+        print("ERROR: members/manifest.json must be an array of member ids", file=sys.stderr)
+        sys.exit(1)
+
+    wrote = 0
+    for mid in ids:
+        if not os.path.isdir(os.path.join(MEMBERS_DIR, mid)):
+            print(f"skip {mid}: no members/{mid}/", file=sys.stderr)
+            continue
+        if render(mid, force=args.force):
+            wrote += 1
+            print(f"- wrote members/{mid}/{OUT_NAME}")
+    print(f"[ok] {wrote} of {len(ids)} member pages rendered ({len(ids) - wrote} unchanged)")
+
+if __name__ == "__main__":
+    main()
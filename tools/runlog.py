@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Run instrumentation shared by the tools.
+
+  with runlog.span("s2.paging"): ...     # or @runlog.span("s2.paging")
+  runlog.instrument(session)            # per-host request/bytes/status counters
+  runlog.cache("og", hit=True)          # cache hit/miss
+  runlog.count("papers", 12)
+  runlog.write_report("s2_to_member_json")   # -> data/_runs/s2_to_member_json.json
+
+State is process-global (each tool is one run) and guarded by a lock so
+worker threads can record into it.
+"""
+
+import json, os, threading, time
+from collections import Counter, defaultdict
+from contextlib import ContextDecorator
+from urllib.parse import urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS_DIR = os.environ.get("RUN_REPORT_DIR") or os.path.join(ROOT, "data", "_runs")
+
+_lock = threading.Lock()
+_t0 = time.perf_counter()
+_started = int(time.time())
+_spans = defaultdict(lambda: {"count": 0, "total_s": 0.0, "max_s": 0.0})
+_hosts = defaultdict(lambda: {"requests": 0, "bytes": 0, "errors": 0, "throttled": 0,
+                              "time_s": 0.0, "status": Counter()})
+_cache = defaultdict(lambda: {"hit": 0, "miss": 0})
+_counters = Counter()
+
+class span(ContextDecorator):
+    """Time a block (context manager) or every call of a function (decorator)."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def _recreate_cm(self):
+        # Decorator use: a fresh instance per call, so overlapping calls
+        # (threads, recursion) do not share a start time.
+        return span(self.name)
+
+    def __enter__(self):
+        self._t = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        dt = time.perf_counter() - self._t
+        with _lock:
+            s = _spans[self.name]
+            s["count"] += 1
+            s["total_s"] += dt
+            s["max_s"] = max(s["max_s"], dt)
+        return False
+
+def count(name, n=1):
+    with _lock:
+        _counters[name] += n
+
+def cache(name, hit):
+    with _lock:
+        _cache[name]["hit" if hit else "miss"] += 1
+
+def record_request(url, status=None, nbytes=0, elapsed=0.0):
+    host = urlparse(url).netloc or url
+    with _lock:
+        h = _hosts[host]
+        h["requests"] += 1
+        h["bytes"] += nbytes
+        h["time_s"] += elapsed
+        if status is None:
+            h["errors"] += 1
+        else:
+            h["status"][str(status)] += 1
+            if status == 429:
+                h["throttled"] += 1
+
+def instrument(session):
+    """Wrap session.send so every request (including redirect hops) is recorded."""
+    if getattr(session, "_runlog", False):
+        return session
+    send = session.send
+
+    def recorded_send(request, **kw):
+        t = time.perf_counter()
+        try:
+            r = send(request, **kw)
+        except Exception:
+            record_request(request.url, None, 0, time.perf_counter() - t)
+            raise
+        nbytes = 0 if kw.get("stream") else len(r.content or b"")
+        record_request(request.url, r.status_code, nbytes, time.perf_counter() - t)
+        return r
+
+    session.send = recorded_send
+    session._runlog = True
+    return session
+
+def report(tool):
+    with _lock:
+        return {
+            "tool": tool,
+            "started_at": _started,
+            "wall_s": round(time.perf_counter() - _t0, 3),
+            "spans": {k: {"count": v["count"], "total_s": round(v["total_s"], 4), "max_s": round(v["max_s"], 4)}
+                      for k, v in sorted(_spans.items())},
+            "hosts": {k: {**{f: v[f] for f in ("requests", "bytes", "errors", "throttled")},
+                          "time_s": round(v["time_s"], 3), "status": dict(v["status"])}
+                      for k, v in sorted(_hosts.items())},
+            "cache": {k: {**v, "hit_rate": round(v["hit"] / ((v["hit"] + v["miss"]) or 1), 4)}
+                      for k, v in sorted(_cache.items())},
+            "counters": dict(sorted(_counters.items())),
+        }
+
+def write_report(tool, path=None):
+    path = path or os.path.join(RUNS_DIR, f"{tool}.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(report(tool), f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+    return path
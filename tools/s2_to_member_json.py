@@ -1,16 +1,27 @@
 #!/usr/bin/env python3
-import json, os, time, sys
+import argparse, json, os, time, sys
 from urllib.parse import quote
-import requests
+import runlog
+from checkpoint import Journal, NullJournal
+from publication import Publication
 
 ROOT = os.path.dirname(os.path.dirname(__file__))
 MANIFEST = os.path.join(ROOT, "members", "manifest.json")
 
-S2_BASE = "https://api.semanticscholar.org/graph/v1"
+S2_BASE = os.environ.get("S2_API_BASE", "https://api.semanticscholar.org/graph/v1").rstrip("/")
 # Include paperId + openAccessPdf; author list kept small (names only)
 PAPER_FIELDS = "paperId,title,year,venue,url,externalIds,authors,openAccessPdf"
 PAGE_SIZE = 100
 
+_session = None
+
+def get_session():
+    global _session
+    if _session is None:
+        import requests
+        _session = runlog.instrument(requests.Session())
+    return _session
+
 def read_json(path):
     try:
         with open(path, "r", encoding="utf-8") as f:
@@ -34,21 +45,49 @@ def ids_from(val):
     if isinstance(val, (list, tuple)): return [str(x) for x in val if str(x).strip()]
     return [str(val)]
 
-def fetch_author_papers(aid):
+def fetch_page(aid, offset):
+    url = f"{S2_BASE}/author/{quote(str(aid))}/papers?limit={PAGE_SIZE}&offset={offset}&fields={PAPER_FIELDS}"
+    r = get_session().get(url, timeout=45)
+    r.raise_for_status()
+    j = r.json()
+    return {"data": j.get("data") or j.get("papers") or [], "next": j.get("next")}
+
+@runlog.span("s2.paging")
+def fetch_author_papers(aid, journal=None):
+    """
+    Follows the response's `next` offset; the server may cap `limit` below
+    PAGE_SIZE, so a short page only ends the list when there is no `next`.
+    """
+    journal = journal or NullJournal()
     items, offset = [], 0
     while True:
-        url = f"{S2_BASE}/author/{quote(str(aid))}/papers?limit={PAGE_SIZE}&offset={offset}&fields={PAPER_FIELDS}"
-        r = requests.get(url, timeout=45)
-        r.raise_for_status()
-        j = r.json()
-        data = j.get("data") or j.get("papers") or []
+        page = journal.memo("page", f"{aid}:{offset}", lambda: fetch_page(aid, offset))
+        if isinstance(page, list): page = {"data": page}     # journal from an older run
+        data = page.get("data") or []
         if not data: break
+        runlog.count("s2.pages")
         items.extend(data)
-        if len(data) < PAGE_SIZE: break
-        offset += PAGE_SIZE
+        if page.get("next") is not None:
+            if int(page["next"]) <= offset: break
+            offset = int(page["next"])
+        elif len(data) < PAGE_SIZE:
+            break
+        else:
+            offset += PAGE_SIZE
     return items
 
-def normalize(p):
+def fetch_details(paper_id):
+  """abstract/topics/fieldsOfStudy for one paper, or None if the request failed."""
+  try:
+    details_url = f"{S2_BASE}/paper/{quote(str(paper_id))}"
+    params = {"fields": "abstract,topics,fieldsOfStudy"}
+    with runlog.span("s2.details"):
+      r = get_session().get(details_url, params=params, timeout=30)
+    return r.json() if r.ok else None
+  except Exception:
+    return None  # stay silent; keep base fields
+
+def normalize(p, journal=None):
   # original flat shape from /author/{id}/papers
   title = p.get("title") or ""
   year  = p.get("year")
@@ -60,17 +99,17 @@ def normalize(p):
   url   = f"https://doi.org/{doi}" if doi else (p.get("url") or "")
   authors = [a.get("name") for a in (p.get("authors") or []) if isinstance(a, dict) and a.get("name")]
 
-  out = {
-    "paperId": p.get("paperId") or None,
-    "title": title,
-    "year": year,
-    "venue": venue,
-    "doi": str(doi) if doi else None,
-    "url": url,
-    "authors": authors,
-    "oa_pdf": oa,
-    "arxivId": arxiv
-  }
+  out = Publication(
+    paperId=p.get("paperId") or None,
+    title=title,
+    year=year,
+    venue=venue,
+    doi=str(doi) if doi else None,
+    url=url,
+    authors=authors,
+    oa_pdf=oa,
+    arxivId=arxiv,
+  )
 
   # Try to read extras if they happen to be present already (rare in this endpoint)
   fos = p.get("fieldsOfStudy") or []
@@ -90,32 +129,27 @@ def normalize(p):
   abstract = (p.get("abstract") or "").strip()
 
   # If still missing topics/abstract, fetch lightweight paper details once
-  if not topics and not abstract and out["paperId"]:
-    try:
-      details_url = f"{S2_BASE}/paper/{quote(str(out['paperId']))}"
-      params = {"fields": "abstract,topics,fieldsOfStudy"}
-      r = requests.get(details_url, params=params, timeout=30)
-      if r.ok:
-        pj = r.json()
-        # fieldsOfStudy
-        if not fos:
-          fos = pj.get("fieldsOfStudy") or []
-        # topics
-        raw = pj.get("topics") or []
-        if raw:
-          seen = set()
-          for t in raw:
-            name = (t.get("topic") if isinstance(t, dict) else str(t)).strip() if t else ""
-            if name:
-              key = name.lower()
-              if key not in seen:
-                seen.add(key)
-                topics.append(name)
-        # abstract
-        if not topics:
-          abstract = (pj.get("abstract") or "").strip()
-    except Exception:
-      pass  # stay silent; keep base fields
+  if not topics and not abstract and out.paperId:
+    journal = journal or NullJournal()
+    pj = journal.memo("details", out.paperId, lambda: fetch_details(out.paperId))
+    if pj:
+      # fieldsOfStudy
+      if not fos:
+        fos = pj.get("fieldsOfStudy") or []
+      # topics
+      raw = pj.get("topics") or []
+      if raw:
+        seen = set()
+        for t in raw:
+          name = (t.get("topic") if isinstance(t, dict) else str(t)).strip() if t else ""
+          if name:
+            key = name.lower()
+            if key not in seen:
+              seen.add(key)
+              topics.append(name)
+      # abstract
+      if not topics:
+        abstract = (pj.get("abstract") or "").strip()
 
   if fos:
     out["fieldsOfStudy"] = fos
@@ -129,32 +163,50 @@ def normalize(p):
 def norm_key(n):
     return (n.get("doi") or (n.get("title") or "").lower()).strip()
 
-def main():
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Fetch members' Semantic Scholar publications.")
+    ap.add_argument("--resume", action="store_true",
+                    help="continue a failed run: skip members, pages and paper details it finished")
+    args = ap.parse_args(argv)
+
     manifest = read_json(MANIFEST)
     if not isinstance(manifest, list):
         print("ERROR: members/manifest.json must be an array of member ids", file=sys.stderr)
         sys.exit(1)
 
+    journal = Journal("s2_to_member_json", resume=args.resume)
+    failed = []
     for mid in manifest:
+        if journal.done("member", mid):
+            continue
         prof = get_profile(mid)
         aids = ids_from(prof.get("semanticScholarId"))
         if not aids:
             print(f"skip {mid}: no semanticScholarId", file=sys.stderr)
             continue
 
-        raw = []
+        raw, ok = [], True
         for aid in aids:
             try:
-                raw.extend(fetch_author_papers(aid))
+                raw.extend(fetch_author_papers(aid, journal))
             except Exception as e:
                 print(f"ERROR fetch {mid}/{aid}: {e}", file=sys.stderr)
+                ok = False
+        if not ok:
+            # Keep the previous publications.json and leave the member
+            # unrecorded, so --resume fetches it again.
+            failed.append(mid)
+            continue
 
         dedup = {}
-        for r in raw:
-            n = normalize(r)
-            k = norm_key(n)
-            if k and k not in dedup:
-                dedup[k] = n
+        with runlog.span("normalize"):
+            for r in raw:
+                n = normalize(r, journal)
+                k = norm_key(n)
+                if k and k not in dedup:
+                    dedup[k] = n
+        runlog.count("papers.raw", len(raw))
+        runlog.count("papers.unique", len(dedup))
 
         pubs = list(dedup.values())
         pubs.sort(key=lambda x: (x.get("year") or 0, x.get("title") or ""), reverse=True)
@@ -164,9 +216,19 @@ def main():
             "source": "semantic_scholar",
             "author_ids": aids,
             "updated_at": int(time.time()),
-            "publications": pubs
+            "publications": [p.to_dict() for p in pubs]
         })
         print(f"- wrote {out} with {len(pubs)} items")
+        journal.record("member", mid)
+    if failed:
+        print(f"WARNING: {len(failed)} member(s) not updated: {', '.join(failed)}; "
+              f"rerun with --resume to retry them", file=sys.stderr)
+        journal.close()
+    else:
+        journal.complete()
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        runlog.write_report("s2_to_member_json")